@@ -0,0 +1,69 @@
+"""
+Runs benchmarks and prints median and tail latency per operation with throughput.
+
+    python -m benchmarks                      # run all
+    python -m benchmarks -k parsers           # run matching names only
+    python -m benchmarks --save               # save results as baseline
+    python -m benchmarks --compare            # compare with saved baseline, exit 1 on regression
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from . import bench_parsers, bench_builders, bench_requests  # noqa: F401  registers benchmarks
+from .harness import BENCHMARKS, PERCENTILES, run_benchmark, save_baseline, load_baseline, compare, format_time
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    arg_parser.add_argument("-k", dest="keyword", default="", help="run only benchmarks with this in name")
+    arg_parser.add_argument("--rounds", type=int, default=50, help="timed rounds per benchmark")
+    arg_parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, type=Path, help="save results as baseline")
+    arg_parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, type=Path, help="baseline to compare")
+    arg_parser.add_argument("--threshold", type=float, default=0.1, help="allowed median slowdown, 0.1 is 10%%")
+    args = arg_parser.parse_args()
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = []
+    regressions = []
+
+    header = f"{'benchmark':<36}{'ops/s':>12}" + "".join(f"{f'p{p}':>11}" for p in PERCENTILES)
+    print(header + (f"{'vs base':>10}" if baseline else ""))
+
+    for bench in BENCHMARKS:
+        if args.keyword not in bench.full_name:
+            continue
+
+        try:
+            result = run_benchmark(bench, args.rounds)
+        except ImportError as e:
+            print(f"{bench.full_name:<36}skipped: {e}")
+            continue
+
+        results.append(result)
+        line = f"{result.name:<36}{result.throughput:>12.1f}"
+        line += "".join(f"{format_time(result.percentile(p)):>11}" for p in PERCENTILES)
+
+        change, is_regression = compare(result, baseline, args.threshold)
+        if change is not None:
+            line += f"{change:>+10.1%}" + (" REGRESSION" if is_regression else "")
+        if is_regression:
+            regressions.append(result.name)
+        print(line)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Baseline saved to {args.save}")
+
+    if regressions:
+        print(f"Regressed over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
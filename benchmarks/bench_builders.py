@@ -0,0 +1,33 @@
+from typing import Iterator
+
+from RESTModels.builders import build_path, build_body
+from RESTModels.parsers.args_parsers import get_args_dict
+from RESTModels.resources import BodyType
+
+from .harness import benchmark, Operation
+
+
+@benchmark("builders", "build_path", number=10000)
+def path() -> Iterator[Operation]:
+    params = {"user_id": 42, "todo_id": 7, "expand": True}
+    yield lambda: build_path("/users/{user_id}/todos/{todo_id}", params)
+
+
+@benchmark("builders", "build_body_embedded", number=10000)
+def embedded_body() -> Iterator[Operation]:
+    params = {"title": "Buy milk", "done": False, "tags": ["home"], "user_id": 42}
+    yield lambda: build_body(("title", "done", "tags"), params, BodyType.EMBEDDED)
+
+
+@benchmark("builders", "build_body_flat", number=10000)
+def flat_body() -> Iterator[Operation]:
+    params = {"text": "Some note", "user_id": 42}
+    yield lambda: build_body(("text",), params, BodyType.FLAT)
+
+
+@benchmark("builders", "get_args_dict", number=10000)
+def args_dict() -> Iterator[Operation]:
+    names = ("self", "user_id", "title", "done", "tags")
+    args = (None, 42, "Buy milk")
+    kwargs = {"done": False, "tags": ["home"]}
+    yield lambda: get_args_dict(names, args, kwargs)
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, TypedDict
+
+from RESTModels.parsers.type_alias_parsers import TypeAliasParser
+
+from .harness import benchmark, Operation
+
+
+@dataclass
+class Tag:
+    id: int
+    name: str
+
+
+@dataclass
+class Todo:
+    id: int
+    title: str
+    done: bool
+    created_at: datetime
+    tags: list[Tag]
+    rating: float | None
+
+
+class User(TypedDict):
+    id: int
+    login: str
+    scores: dict[str, list[int]]
+
+
+def make_todo(id_: int) -> dict[str, object]:
+    return {
+        "id": id_,
+        "title": f"Todo {id_}",
+        "done": id_ % 2 == 0,
+        "created_at": "2024-01-02T03:04:05",
+        "tags": [{"id": tag_id, "name": f"tag{tag_id}"} for tag_id in range(3)],
+        "rating": None if id_ % 3 else id_ / 3,
+    }
+
+
+def make_user(id_: int) -> dict[str, object]:
+    return {
+        "id": str(id_),
+        "login": f"user{id_}",
+        "scores": {f"game{game}": list(range(10)) for game in range(5)},
+    }
+
+
+def parse(alias: object, value: object) -> Iterator[Operation]:
+    parser = TypeAliasParser()
+    yield lambda: parser(value, alias)
+
+
+@benchmark("parsers", "list_int_10", number=1000)
+def list_int_small() -> Iterator[Operation]:
+    yield from parse(list[int], list(range(10)))
+
+
+@benchmark("parsers", "list_int_10000", number=10)
+def list_int_large() -> Iterator[Operation]:
+    yield from parse(list[int], list(range(10000)))
+
+
+@benchmark("parsers", "dataclass_todo_1", number=1000)
+def todo_single() -> Iterator[Operation]:
+    yield from parse(Todo, make_todo(1))
+
+
+@benchmark("parsers", "dataclass_todo_1000", number=3)
+def todo_list() -> Iterator[Operation]:
+    yield from parse(list[Todo], [make_todo(i) for i in range(1000)])
+
+
+@benchmark("parsers", "typed_dict_user_100", number=10)
+def user_list() -> Iterator[Operation]:
+    yield from parse(list[User], [make_user(i) for i in range(100)])
+
+
+@benchmark("parsers", "dict_tuple_1000", number=10)
+def dict_of_tuples() -> Iterator[Operation]:
+    yield from parse(dict[str, tuple[int, str, float]], {str(i): (i, str(i), i / 2) for i in range(1000)})
+
+
+@benchmark("parsers", "list_datetime_10000", number=10)
+def datetime_list() -> Iterator[Operation]:
+    yield from parse(list[datetime], [f"2024-01-02T03:{i // 60 % 60:02}:{i % 60:02}+00:00" for i in range(10000)])
+
+
+@benchmark("parsers", "list_datetime_repeated_10000", number=10)
+def repeated_datetime_list() -> Iterator[Operation]:
+    yield from parse(list[datetime], [f"2024-01-02T03:04:{i % 10:02}+00:00" for i in range(10000)])
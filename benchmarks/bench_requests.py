@@ -0,0 +1,70 @@
+import asyncio
+import json
+from typing import Iterator
+
+from RESTModels import ResourceModel, SyncClient, AsyncClient, get, post
+
+from .bench_parsers import Todo, make_todo
+from .harness import benchmark, Operation
+from .server import run_server
+
+
+ROUTES = {
+    "/users/42/todos/1": json.dumps(make_todo(1)).encode(),
+    "/users/42/todos": json.dumps([make_todo(i) for i in range(100)]).encode(),
+    "/users/42/todo": json.dumps(make_todo(2)).encode(),
+}
+
+
+class TodosModel(ResourceModel):
+    @get("/users/{user_id}/todos/{todo_id}")
+    def get_todo(self, user_id: int, todo_id: int) -> Todo:
+        ...
+
+    @get("/users/{user_id}/todos")
+    def get_todos(self, user_id: int, limit: int = 100) -> list[Todo]:
+        ...
+
+    @post("/users/{user_id}/todo", body=("title", "done"))
+    def make_todo(self, user_id: int, title: str, done: bool) -> Todo:
+        ...
+
+
+class AsyncTodosModel(ResourceModel):
+    @get("/users/{user_id}/todos/{todo_id}")
+    async def get_todo(self, user_id: int, todo_id: int) -> Todo:
+        ...
+
+
+@benchmark("requests", "sync_get_one", number=20)
+def sync_get_one() -> Iterator[Operation]:
+    with run_server(ROUTES) as server, SyncClient(server.url) as client:
+        model = TodosModel(client)
+        yield lambda: model.get_todo(42, 1)
+
+
+@benchmark("requests", "sync_get_100", number=10)
+def sync_get_many() -> Iterator[Operation]:
+    with run_server(ROUTES) as server, SyncClient(server.url) as client:
+        model = TodosModel(client)
+        yield lambda: model.get_todos(42)
+
+
+@benchmark("requests", "sync_post", number=20)
+def sync_post() -> Iterator[Operation]:
+    with run_server(ROUTES) as server, SyncClient(server.url) as client:
+        model = TodosModel(client)
+        yield lambda: model.make_todo(42, "Buy milk", False)
+
+
+@benchmark("requests", "async_get_one", number=20)
+def async_get_one() -> Iterator[Operation]:
+    loop = asyncio.new_event_loop()
+    with run_server(ROUTES) as server:
+        client = AsyncClient(server.url)
+        model = AsyncTodosModel(client)
+        try:
+            yield lambda: loop.run_until_complete(model.get_todo(42, 1))
+        finally:
+            loop.run_until_complete(client.close())
+            loop.close()
@@ -0,0 +1,137 @@
+import gc
+import json
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+
+Operation = Callable[[], Any]
+BenchmarkSetup = Callable[[], AbstractContextManager[Operation]]
+
+PERCENTILES = (50, 90, 99)
+
+
+class Benchmark:
+    """
+    :param group: benchmarks group, like "parsers" or "requests"
+    :param name: unique name inside group
+    :param setup: context manager factory that prepares data and yields operation to time
+    :param number: operations per timed round, so fast operations aren't dominated by timer overhead
+    """
+
+    def __init__(self, group: str, name: str, setup: BenchmarkSetup, number: int) -> None:
+        self.group = group
+        self.name = name
+        self.setup = setup
+        self.number = number
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.group}.{self.name}"
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(group: str, name: str, number: int = 1) -> Callable[[Callable[[], Iterator[Operation]]], BenchmarkSetup]:
+    """
+    Registers generator function that yields operation to time. Code after yield is teardown
+    """
+
+    def decorator(func: Callable[[], Iterator[Operation]]) -> BenchmarkSetup:
+        setup = contextmanager(func)
+        BENCHMARKS.append(Benchmark(group, name, setup, number))
+        return setup
+
+    return decorator
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        raise ValueError("Percentile of empty sequence")
+
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class BenchmarkResult:
+    """
+    :param timings: seconds per single operation, one per round
+    """
+
+    def __init__(self, name: str, timings: list[float]) -> None:
+        self.name = name
+        self.timings = sorted(timings)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Operations per second
+        """
+
+        return len(self.timings) / sum(self.timings)
+
+    def percentile(self, percent: float) -> float:
+        return percentile(self.timings, percent)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "throughput": self.throughput,
+            **{f"p{percent}": self.percentile(percent) for percent in PERCENTILES},
+        }
+
+
+def run_benchmark(bench: Benchmark, rounds: int, warmup_rounds: int = 3) -> BenchmarkResult:
+    with bench.setup() as operation:
+        for _ in range(warmup_rounds * bench.number):
+            operation()
+
+        timings = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = perf_counter()
+                for _ in range(bench.number):
+                    operation()
+                timings.append((perf_counter() - start) / bench.number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    return BenchmarkResult(bench.full_name, timings)
+
+
+def save_baseline(path: Path, results: list[BenchmarkResult]) -> None:
+    path.write_text(json.dumps({result.name: result.to_dict() for result in results}, indent=2))
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    return json.loads(path.read_text())  # type: ignore[no-any-return]
+
+
+def compare(
+        result: BenchmarkResult,
+        baseline: dict[str, dict[str, float]],
+        threshold: float,
+) -> tuple[float | None, bool]:
+    """
+    Returns change of median latency relative to baseline (0.1 is 10% slower)
+    and whether it's a regression over threshold
+    """
+
+    if result.name not in baseline:
+        return None, False
+
+    change = result.percentile(50) / baseline[result.name]["p50"] - 1
+    return change, change > threshold
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
@@ -0,0 +1,59 @@
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Iterator
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    In-process HTTP/1.1 server answering fixed bodies by path, so end-to-end benchmarks measure client side only
+    """
+
+    daemon_threads = True
+
+    def __init__(self, routes: dict[str, bytes]) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.routes = routes
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are written separately, don't wait for delayed ACK
+    server: StubServer
+
+    def _handle(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = self.server.routes.get(self.path.split("?", 1)[0])
+        if body is None:
+            self.send_response(404)
+            body = b"null"
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def run_server(routes: dict[str, bytes]) -> Iterator[StubServer]:
+    server = StubServer(routes)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -6,8 +6,18 @@ from .requests import (
     patch
 )
 from .resources import ResourceModel
-from .clients import SyncClient
-from .parsers.type_alias_parsers import TypeAliasParser
+from .clients import SyncClient, AsyncClient
+from .parsers.type_alias_parsers import TypeAliasParser, Discriminator, DateTimeFormat
+from .fan_out import Call, fan_out, fan_out_async
+from .caches import ResponseCache
+from .single_flight import SingleFlight
+from .metrics import MetricsRegistry, RequestHook
+from .policies import RetryPolicy, CircuitBreaker, CircuitOpenError, HedgePolicy
+from .limits import RateLimit
+from .batching import batched
+from .pagination import CursorPagination, OffsetPagination, LinkPagination, PageError
+from .offload import ParseOffload
+from .parsers.interning import StringInterner
 
 __all__ = [
     "get",
@@ -17,7 +27,31 @@ __all__ = [
     "patch",
     "ResourceModel",
     "SyncClient",
+    "AsyncClient",
+    "ResponseCache",
+    "SingleFlight",
+    "MetricsRegistry",
+    "RequestHook",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HedgePolicy",
+    "RateLimit",
+    "CursorPagination",
+    "OffsetPagination",
+    "LinkPagination",
+    "PageError",
+    "ParseOffload",
+    "StringInterner",
+    "batched",
+    "Discriminator",
+    "DateTimeFormat",
+    "Call",
+    "fan_out",
+    "fan_out_async",
     "register_general_type_parser",
+    "register_type_compiler",
 ]
 
 register_general_type_parser = TypeAliasParser.register_general_type_parser
+register_type_compiler = TypeAliasParser.register_type_compiler
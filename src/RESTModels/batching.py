@@ -0,0 +1,225 @@
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future
+from functools import wraps
+from inspect import iscoroutinefunction, signature
+from typing import Any, Callable, Hashable, Sequence, TypeVar, cast, TYPE_CHECKING
+
+from .resources import ResourceModel
+from .parsers.args_parsers import get_args_dict
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+T = TypeVar("T")
+KeyGetter = Callable[[Any], Hashable]
+
+
+def get_key_getter(key: str | KeyGetter | None) -> KeyGetter | None:
+    """
+    Key of bulk result item: field of dict, attribute of object or custom function
+    """
+
+    if key is None or callable(key):
+        return key
+
+    def get_key(item: Any) -> Hashable:
+        if isinstance(item, Mapping):
+            return item[key]  # type: ignore[no-any-return]
+        return getattr(item, key)  # type: ignore[no-any-return]
+
+    return get_key
+
+
+class Batch:
+    """
+    :param full: event set when batch reached max size
+    :param new_future: factory of futures for callers results
+    """
+
+    def __init__(self, full: "threading.Event | asyncio.Event", new_future: Callable[[], Any]) -> None:
+        self.futures: dict[Hashable, Any] = {}
+        self.full = full
+        self.new_future = new_future
+
+
+class Batcher:
+    """
+    Collects calls with single key into batches and makes one bulk call per batch.
+    Batch is sent when window passed since its first call or when it's full
+
+    :param bulk_method: endpoint taking list of keys and returning list of results
+    :param key: how to get key of bulk result, results are matched by position if None
+    :param window: seconds to collect calls, asyncio batches also include calls made in the same loop iteration
+    :param max_batch_size: max keys in one bulk call
+    """
+
+    def __init__(
+            self,
+            bulk_method: Callable[..., Any],
+            key: str | KeyGetter | None,
+            window: float,
+            max_batch_size: int,
+    ) -> None:
+
+        self.bulk_method = bulk_method
+        self.get_key = get_key_getter(key)
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._pending: dict[Hashable, Batch] = {}
+        self._sending: set["asyncio.Task[None]"] = set()
+        self._lock = threading.Lock()
+
+    def _join(self, batch_key: Hashable, key: Hashable, new_batch: Callable[[], Batch]) -> tuple[Batch, bool]:
+        """
+        Adds key to pending batch, returns the batch and whether caller is its leader that sends it
+        """
+
+        with self._lock:
+            batch = self._pending.get(batch_key)
+            is_leader = batch is None
+            if batch is None:
+                batch = self._pending[batch_key] = new_batch()
+
+            if key not in batch.futures:
+                batch.futures[key] = batch.new_future()
+
+            if len(batch.futures) >= self.max_batch_size:
+                del self._pending[batch_key]
+                batch.full.set()
+        return batch, is_leader
+
+    def _close(self, batch_key: Hashable, batch: Batch) -> None:
+        with self._lock:
+            if self._pending.get(batch_key) is batch:
+                del self._pending[batch_key]
+            self.batches += 1
+
+    def _split(self, batch: Batch, results: Sequence[Any]) -> None:
+        try:
+            keys = list(batch.futures)
+            if self.get_key is None:
+                if len(results) != len(keys):
+                    raise ValueError(f"Bulk call returned {len(results)} results for {len(keys)} keys")
+                results_by_key = dict(zip(keys, results))
+            else:
+                results_by_key = {self.get_key(result): result for result in results}
+        except BaseException as error:  # malformed bulk result must fail all callers, not only the leader
+            self._fail(batch, error)
+            return
+
+        for key, future in batch.futures.items():
+            if future.done():
+                continue
+            if key in results_by_key:
+                future.set_result(results_by_key[key])
+            else:
+                future.set_exception(KeyError(key))
+
+    @staticmethod
+    def _fail(batch: Batch, error: BaseException) -> None:
+        for future in batch.futures.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def call(self, model: ResourceModel, key: Hashable) -> Any:
+        batch, is_leader = self._join(model, key, lambda: Batch(threading.Event(), Future))
+        future = batch.futures[key]
+
+        if is_leader:
+            assert isinstance(batch.full, threading.Event)
+            batch.full.wait(self.window)
+            self._close(model, batch)
+            try:
+                results = self.bulk_method(model, list(batch.futures))
+            except BaseException as error:
+                self._fail(batch, error)
+            else:
+                self._split(batch, results)
+
+        return future.result()
+
+    async def call_async(self, model: ResourceModel, key: Hashable) -> Any:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        batch_key = (loop, model)
+        batch, is_leader = self._join(batch_key, key, lambda: Batch(asyncio.Event(), loop.create_future))
+        future = batch.futures[key]
+
+        if is_leader:
+            assert isinstance(batch.full, asyncio.Event)
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.window)
+            except TimeoutError:
+                pass
+            finally:
+                # batch is sent in own task, so it isn't left pending when leader is cancelled while waiting
+                self._close(batch_key, batch)
+                sending = loop.create_task(self._send_async(model, batch))
+                self._sending.add(sending)
+                sending.add_done_callback(self._sending.discard)
+
+        return await asyncio.shield(future)  # caller with the same key may still wait for the future
+
+    async def _send_async(self, model: ResourceModel, batch: Batch) -> None:
+        import asyncio
+
+        try:
+            results = await self.bulk_method(model, list(batch.futures))
+        except asyncio.CancelledError:
+            for future in batch.futures.values():
+                future.cancel()
+            raise
+        except BaseException as error:
+            self._fail(batch, error)
+        else:
+            self._split(batch, results)
+
+
+def batched(
+        bulk_method: Callable[..., Any],
+        key: str | KeyGetter | None = None,
+        window: float = 0.005,
+        max_batch_size: int = 100,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Makes method with single key argument send its calls through bulk_method in batches.
+    Call sites don't change, concurrent calls from threads or asyncio tasks share one bulk request.
+    Bulk method of async method must be async too
+
+    :param bulk_method: endpoint taking list of keys and returning list of results
+    :param key: field or attribute of result that holds its key, or function returning it.
+        Results are matched to keys by position if None
+    :param window: seconds to collect calls into batch
+    :param max_batch_size: max keys in one bulk call
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        params_names = tuple(signature(func).parameters)
+        if len(params_names) != 2:
+            raise TypeError(f"Batched method must take exactly one argument besides self, got {params_names[1:]}")
+
+        batcher = Batcher(bulk_method, key, window, max_batch_size)
+        model_name, key_name = params_names
+
+        def bind(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[ResourceModel, Hashable]:
+            params = get_args_dict(params_names, args, kwargs)
+            return params[model_name], params[key_name]
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def batched_async_call(*args: Any, **kwargs: Any) -> Any:
+                return await batcher.call_async(*bind(args, kwargs))
+
+            return cast(Callable[..., T], batched_async_call)
+
+        @wraps(func)
+        def batched_call(*args: Any, **kwargs: Any) -> Any:
+            return batcher.call(*bind(args, kwargs))
+
+        return batched_call
+
+    return decorator
@@ -1,18 +1,76 @@
 import re
-from typing import Any, Collection
+from functools import lru_cache
+from typing import Any, Collection, Callable
 
 from .resources import BodyType
 
 
+PATH_PARAM_PATTERN = re.compile(r"\{(\w+)}")
+
+
+class PathTemplate:
+    def __init__(self, path_pattern: str) -> None:
+        self.path_pattern = path_pattern
+
+        parts = PATH_PARAM_PATTERN.split(path_pattern)
+        self.literals: tuple[str, ...] = tuple(parts[0::2])
+        self.params_names: tuple[str, ...] = tuple(parts[1::2])
+        self.unique_params_names: frozenset[str] = frozenset(self.params_names)
+
+    def __call__(self, params: dict[str, Any], exclude_params: bool = False) -> str:
+        if not self.params_names:
+            return self.path_pattern
+
+        literals = self.literals
+        composed_path = [literals[0]]
+        for i, param_name in enumerate(self.params_names, start=1):
+            composed_path.append(str(params[param_name]))
+            composed_path.append(literals[i])
+
+        if exclude_params:
+            for param_name in self.unique_params_names:
+                del params[param_name]
+
+        return "".join(composed_path)
+
+
+@lru_cache(maxsize=256)
+def compile_path(path_pattern: str) -> PathTemplate:
+    return PathTemplate(path_pattern)
+
+
 def build_path(path_pattern: str, params: dict[str, Any], exclude_params: bool = False) -> str:
-    composed_path = path_pattern
+    return compile_path(path_pattern)(params, exclude_params)
+
+
+BodyBuilder = Callable[[dict[str, Any]], dict[str, Any] | str]
 
-    matches = re.findall(r"\{\w+}", composed_path)
-    for match in matches:
-        param = params.pop(match[1:-1]) if exclude_params else params[match[1:-1]]
-        composed_path = composed_path.replace(match, str(param))
 
-    return composed_path
+def compile_body(body_params: Collection[str], body_type: BodyType) -> BodyBuilder:
+    """
+    Validates body settings once and returns builder that pops body params from params dict
+    """
+
+    body_params = tuple(body_params)
+
+    match body_type:
+        case BodyType.EMBEDDED:
+            def build_embedded_body(params: dict[str, Any]) -> dict[str, Any]:
+                return {body_param_name: params.pop(body_param_name) for body_param_name in body_params}
+            return build_embedded_body
+
+        case BodyType.FLAT if len(body_params) == 1:
+            param_name = body_params[0]
+
+            def build_flat_body(params: dict[str, Any]) -> str:
+                return str(params.pop(param_name))
+            return build_flat_body
+
+        case BodyType.FLAT if len(body_params) > 1:
+            raise ValueError(f"{body_type} cannot be set with more than one body param")
+
+        case _:
+            raise ValueError(f"Can't build body with type {body_type}")
 
 
 # I think here is mypy bug on return type check
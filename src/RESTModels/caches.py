@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from http import HTTPMethod
+from time import monotonic
+from typing import Any, Hashable, Mapping
+
+
+class CacheEntry:
+    def __init__(
+            self,
+            value: Any,
+            size: int,
+            expires_at: float,
+            etag: str | None = None,
+            last_modified: str | None = None,
+    ) -> None:
+
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def is_fresh(self) -> bool:
+        return monotonic() < self.expires_at
+
+    @property
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    LRU cache of parsed responses, bounded by entries count and raw responses size in bytes.
+    Shared by all threads and tasks that use the client. Cached results are shared too - don't mutate them
+
+    :param max_entries: max count of cached responses
+    :param max_bytes: max summary size of cached responses bodies
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(method: HTTPMethod, endpoint_path: str, params: Mapping[str, Any]) -> Hashable:
+        return method, endpoint_path, tuple(sorted((name, repr(value)) for name, value in params.items()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self.size -= previous_entry.size
+
+            self._entries[key] = entry
+            self.size += entry.size
+
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self.size -= evicted_entry.size
+
+    def refresh(self, entry: CacheEntry, ttl: float) -> None:
+        entry.expires_at = monotonic() + ttl
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -1,22 +1,91 @@
+import threading
+from contextlib import nullcontext
 from http import HTTPMethod
 from abc import ABC, abstractmethod
-from typing import Any
+from time import monotonic
+from types import TracebackType
+from typing import Any, Mapping, Self, Iterator, AsyncIterator, Sequence, TYPE_CHECKING
 
-import requests
+from .caches import ResponseCache
+from .single_flight import SingleFlight
+from .json_codecs import JSONCodec, StdlibJSONCodec, get_default_codec
+from .metrics import RequestHook, RequestObserver, Phase
+from .limits import RateLimit
+
+if TYPE_CHECKING:
+    import asyncio
+    import aiohttp
+    import requests
+
+
+class Response:
+    """
+    Transport independent HTTP response
+    """
+
+    def __init__(
+            self,
+            status_code: int,
+            headers: Mapping[str, str],
+            content: bytes,
+            codec: JSONCodec | None = None,
+    ) -> None:
+
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.codec = codec or StdlibJSONCodec()
+
+    def json(self) -> Any:
+        return self.codec.decode(self.content)
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class Client(ABC):
-    def __init__(self, api_url: str) -> None:
+    # errors of failed connection or timed out request, that can be retried
+    transient_errors: tuple[type[BaseException], ...] = (OSError,)
+
+    def __init__(
+            self,
+            api_url: str,
+            cache: ResponseCache | None = None,
+            single_flight: SingleFlight | None = None,
+            codec: JSONCodec | None = None,
+            hooks: Sequence[RequestHook] = (),
+            rate_limit: RateLimit | None = None,
+    ) -> None:
+
         self.api_url = api_url
+        self.cache = cache
+        self.single_flight = single_flight
+        self.codec = codec or get_default_codec()
+        self.hooks = list(hooks)
+        self.rate_limit = rate_limit
+
+    def encode_body(
+            self,
+            body: dict[str, Any] | str | None,
+            headers: Mapping[str, str] | None,
+    ) -> tuple[bytes | None, Mapping[str, str] | None]:
+
+        if body is None:
+            return None, headers
+        return self.codec.encode(body), {**JSON_HEADERS, **(headers or {})}
 
     def request(
             self,
             endpoint_path: str,
             method: HTTPMethod,
             params: dict[str, Any],
-            body: dict[str, Any] | str = ""
+            body: dict[str, Any] | str = "",
+            observer: RequestObserver | None = None,
     ) -> Any:
 
+        if observer is not None:
+            return self.observed_request(endpoint_path, method, params, body, observer)
+
         match method:
             case HTTPMethod.GET:
                 return self.get(endpoint_path, params)
@@ -29,6 +98,64 @@ class Client(ABC):
             case HTTPMethod.PATCH:
                 return self.patch(endpoint_path, params, body)
 
+    def observed_request(
+            self,
+            endpoint_path: str,
+            method: HTTPMethod,
+            params: dict[str, Any],
+            body: dict[str, Any] | str,
+            observer: RequestObserver,
+    ) -> Any:
+        """
+        Times network and decoding separately when client implements send, together otherwise
+        """
+
+        try:
+            response = self.send(method, endpoint_path, params, None if method is HTTPMethod.GET else body)
+        except NotImplementedError:
+            return self.request(endpoint_path, method, params, body)
+
+        observer.response(response.status_code, len(response.content))
+        observer.enter(Phase.DECODE)
+        return response.json()
+
+    def send(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+            headers: Mapping[str, str] | None = None,
+    ) -> Any:
+        """
+        Sends request and returns Response (or awaitable of Response) with status and headers.
+        Required by features that need more than decoded body, like response caching
+        """
+
+        raise NotImplementedError
+
+    def warmup(self, connections: int = 1) -> Any:
+        """
+        Opens connections to api_url ahead of first requests, does nothing by default.
+        Returns awaitable for async clients
+        """
+
+        return None
+
+    def stream(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+    ) -> Any:
+        """
+        Sends request and returns iterator (or async iterator) over chunks of response body as they arrive.
+        Required by endpoints that return Iterator[T] or AsyncIterator[T]
+        """
+
+        raise NotImplementedError
+
     @abstractmethod
     def get(self, endpoint_path: str, params: dict[str, Any]) -> Any:
         raise NotImplementedError
@@ -51,22 +178,372 @@ class Client(ABC):
 
 
 class SyncClient(Client):
+    """
+    Keeps connections alive in pool shared by all threads. Each thread gets its own session over this pool,
+    so one client can be used from threaded workers
+
+    :param pool_connections: number of hosts pools to keep
+    :param pool_maxsize: max connections kept per host
+    :param pool_block: wait for free connection instead of opening one over pool_maxsize
+    :param idle_timeout: seconds without requests after which pooled connections are closed
+    :param cache: cache for endpoints declared with cache_ttl
+    :param single_flight: coalesces concurrent identical requests
+    :param codec: JSON codec, orjson if it's installed by default
+    :param hooks: endpoint calls observers, like MetricsRegistry
+    :param rate_limit: rate and concurrency limit of all client requests
+    """
+
+    def __init__(
+            self,
+            api_url: str,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            idle_timeout: float | None = None,
+            cache: ResponseCache | None = None,
+            single_flight: SingleFlight | None = None,
+            codec: JSONCodec | None = None,
+            hooks: Sequence[RequestHook] = (),
+            rate_limit: RateLimit | None = None,
+    ) -> None:
+
+        super().__init__(api_url, cache, single_flight, codec, hooks, rate_limit)
+        from requests.adapters import HTTPAdapter
+
+        self.idle_timeout = idle_timeout
+        self.pool_maxsize = pool_maxsize
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._local = threading.local()
+        self._idle_lock = threading.Lock()
+        self._last_request_time = monotonic()
+
+    @property
+    def transient_errors(self) -> tuple[type[BaseException], ...]:  # type: ignore[override]
+        import requests
+
+        return requests.ConnectionError, requests.Timeout
+
+    @property
+    def session(self) -> "requests.Session":
+        try:
+            return self._local.session  # type: ignore[no-any-return]
+        except AttributeError:
+            import requests
+
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+            return session
+
+    def _evict_idle_connections(self) -> None:
+        with self._idle_lock:
+            now = monotonic()
+            if self.idle_timeout is not None and now - self._last_request_time > self.idle_timeout:
+                self.adapter.poolmanager.clear()
+            self._last_request_time = now
+
+    def send(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+            headers: Mapping[str, str] | None = None,
+    ) -> Response:
+
+        self._evict_idle_connections()
+        data, headers = self.encode_body(body, headers)
+        with self.rate_limit or nullcontext():
+            response = self.session.request(
+                method,
+                self.api_url + endpoint_path,
+                params=params,
+                data=data,
+                headers=headers,
+            )
+
+        if self.rate_limit is not None:
+            self.rate_limit.observe(response.status_code, response.headers)
+        return Response(response.status_code, response.headers, response.content, self.codec)
+
+    def stream(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+            chunk_size: int = 64 * 1024,
+    ) -> Iterator[bytes]:
+
+        self._evict_idle_connections()
+        data, headers = self.encode_body(body, None)
+        with self.rate_limit or nullcontext(), self.session.request(
+            method,
+            self.api_url + endpoint_path,
+            params=params,
+            data=data,
+            headers=headers,
+            stream=True,
+        ) as response:
+            yield from response.iter_content(chunk_size=chunk_size)
+
+    def warmup(self, connections: int = 1) -> None:
+        """
+        Opens connections to api_url with HEAD requests and leaves them in pool, so DNS lookup
+        and TCP and TLS handshakes are done before first call. Response status doesn't matter,
+        connection errors are raised
+
+        :param connections: connections to open, at most pool_maxsize are opened since pool keeps no more
+        """
+
+        self._evict_idle_connections()
+        # streamed responses hold their connections, so each request opens new one.
+        # Requests over pool_maxsize would wait forever for held connections when pool blocks
+        connections = min(connections, self.pool_maxsize)
+        responses = [self.session.head(self.api_url, stream=True) for _ in range(connections)]
+        for response in responses:
+            response.content  # reading empty body returns connection to pool
+
+    def close(self) -> None:
+        self.adapter.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
     def get(self, endpoint_path: str, params: dict[str, Any]) -> Any:
-        response = requests.get(self.api_url + endpoint_path, params=params)
-        return response.json()
+        return self.send(HTTPMethod.GET, endpoint_path, params).json()
 
     def post(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
-        response = requests.post(self.api_url + endpoint_path, params=params, json=body)
-        return response.json()
+        return self.send(HTTPMethod.POST, endpoint_path, params, body).json()
 
     def delete(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
-        response = requests.delete(self.api_url + endpoint_path, params=params, json=body)
-        return response.json()
+        return self.send(HTTPMethod.DELETE, endpoint_path, params, body).json()
 
     def put(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
-        response = requests.put(self.api_url + endpoint_path, params=params, json=body)
-        return response.json()
+        return self.send(HTTPMethod.PUT, endpoint_path, params, body).json()
 
     def patch(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
-        response = requests.patch(self.api_url + endpoint_path, params=params, json=body)
+        return self.send(HTTPMethod.PATCH, endpoint_path, params, body).json()
+
+
+class AsyncClient(Client):
+    """
+    asyncio client over aiohttp. Requires RESTModels[async] extra.
+    Connections are pooled per client, so one client serves any number of concurrent requests on its event loop.
+    Client used on other event loop, like in next asyncio.run, opens new pool there and closes the previous one
+
+    :param limit: max connections kept in total
+    :param limit_per_host: max connections kept per host, 0 for no limit
+    :param keepalive_timeout: seconds to keep idle connection alive
+    :param cache: cache for endpoints declared with cache_ttl
+    :param single_flight: coalesces concurrent identical requests
+    :param codec: JSON codec, orjson if it's installed by default
+    :param hooks: endpoint calls observers, like MetricsRegistry
+    :param rate_limit: rate and concurrency limit of all client requests
+    """
+
+    def __init__(
+            self,
+            api_url: str,
+            limit: int = 100,
+            limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            cache: ResponseCache | None = None,
+            single_flight: SingleFlight | None = None,
+            codec: JSONCodec | None = None,
+            hooks: Sequence[RequestHook] = (),
+            rate_limit: RateLimit | None = None,
+    ) -> None:
+
+        super().__init__(api_url, cache, single_flight, codec, hooks, rate_limit)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: "aiohttp.ClientSession | None" = None
+        self._session_loop: "asyncio.AbstractEventLoop | None" = None
+        self._closing: set["asyncio.Task[None]"] = set()
+
+    @property
+    def transient_errors(self) -> tuple[type[BaseException], ...]:  # type: ignore[override]
+        import aiohttp
+
+        return aiohttp.ClientConnectionError, TimeoutError
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            self._release_session()
+
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    def _release_session(self) -> None:
+        """
+        Closes session of other event loop on that loop, or on running one when that loop is closed already
+        and its connections can only be released
+        """
+
+        import asyncio
+
+        session, session_loop = self._session, self._session_loop
+        self._session = self._session_loop = None
+        if session is None or session.closed:
+            return
+
+        if session_loop is None or session_loop.is_closed():
+            closing = asyncio.get_running_loop().create_task(session.close())
+            self._closing.add(closing)
+            closing.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+
+    async def observed_request(
+            self,
+            endpoint_path: str,
+            method: HTTPMethod,
+            params: dict[str, Any],
+            body: dict[str, Any] | str,
+            observer: RequestObserver,
+    ) -> Any:
+
+        response = await self.send(method, endpoint_path, params, None if method is HTTPMethod.GET else body)
+        observer.response(response.status_code, len(response.content))
+        observer.enter(Phase.DECODE)
         return response.json()
+
+    async def send(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+            headers: Mapping[str, str] | None = None,
+    ) -> Response:
+
+        data, headers = self.encode_body(body, headers)
+        async with self.rate_limit or nullcontext(), self.session.request(
+                method,
+                self.api_url + endpoint_path,
+                params=_build_query(params),
+                data=data,
+                headers=headers,
+        ) as response:
+            content = await response.read()
+
+        if self.rate_limit is not None:
+            self.rate_limit.observe(response.status, response.headers)
+        return Response(response.status, response.headers, content, self.codec)
+
+    async def stream(
+            self,
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: dict[str, Any],
+            body: dict[str, Any] | str | None = None,
+            chunk_size: int = 64 * 1024,
+    ) -> AsyncIterator[bytes]:
+
+        data, headers = self.encode_body(body, None)
+        async with self.rate_limit or nullcontext(), self.session.request(
+                method,
+                self.api_url + endpoint_path,
+                params=_build_query(params),
+                data=data,
+                headers=headers,
+        ) as response:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def warmup(self, connections: int = 1) -> None:
+        """
+        Opens connections to api_url with concurrent HEAD requests and leaves them in pool.
+        Response status doesn't matter, connection errors are raised
+
+        :param connections: connections to open
+        """
+
+        import asyncio
+
+        async def head() -> None:
+            async with self.session.head(self.api_url):
+                pass
+
+        await asyncio.gather(*(head() for _ in range(connections)))
+
+    async def close(self) -> None:
+        import asyncio
+
+        if self._session is None:
+            return
+
+        session_loop = self._session_loop
+        if session_loop is asyncio.get_running_loop() or session_loop is None or session_loop.is_closed():
+            await self._session.close()
+            self._session = self._session_loop = None
+        else:
+            self._release_session()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def get(self, endpoint_path: str, params: dict[str, Any]) -> Any:
+        return (await self.send(HTTPMethod.GET, endpoint_path, params)).json()
+
+    async def post(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
+        return (await self.send(HTTPMethod.POST, endpoint_path, params, body)).json()
+
+    async def delete(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
+        return (await self.send(HTTPMethod.DELETE, endpoint_path, params, body)).json()
+
+    async def put(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
+        return (await self.send(HTTPMethod.PUT, endpoint_path, params, body)).json()
+
+    async def patch(self, endpoint_path: str, params: dict[str, Any], body: dict[str, Any] | str) -> Any:
+        return (await self.send(HTTPMethod.PATCH, endpoint_path, params, body)).json()
+
+
+def _build_query(params: dict[str, Any]) -> list[tuple[str, str]]:
+    """
+    Encodes query params the same way requests does: None values skipped, sequences repeated, others as str
+    """
+
+    query: list[tuple[str, str]] = []
+    for name, value in params.items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else (value,)
+        query.extend((name, str(elem)) for elem in values)
+    return query
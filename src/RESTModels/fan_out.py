@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Call:
+    """
+    Arguments of one call in fan out. Plain tuple means positional args, any other object - single arg
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    @classmethod
+    def from_item(cls, item: Any) -> "Call":
+        if isinstance(item, Call):
+            return item
+        if isinstance(item, tuple):
+            return cls(*item)
+        return cls(item)
+
+
+def fan_out(
+        method: Callable[..., T],
+        calls: Iterable[Any],
+        limit: int = 10,
+) -> list[T | Exception]:
+    """
+    Calls method with each item of calls on thread pool of limit threads.
+
+    :return: results in calls order. Exception raised by call is returned instead of its result
+    """
+
+    def run_call(call: Call) -> T | Exception:
+        try:
+            return method(*call.args, **call.kwargs)
+        except Exception as error:
+            return error
+
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        return list(executor.map(run_call, map(Call.from_item, calls)))
+
+
+async def fan_out_async(
+        method: Callable[..., Awaitable[T]],
+        calls: Iterable[Any],
+        limit: int = 100,
+) -> list[T | Exception]:
+    """
+    Same as fan_out for coroutine methods. Runs calls as tasks with at most limit calls at once
+    """
+
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_call(call: Call) -> T | Exception:
+        async with semaphore:
+            try:
+                return await method(*call.args, **call.kwargs)
+            except Exception as error:
+                return error
+
+    return await asyncio.gather(*(run_call(Call.from_item(item)) for item in calls))
@@ -0,0 +1,66 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class JSONCodec(ABC):
+    """
+    Decodes response bodies from raw bytes and encodes request bodies straight to bytes
+    """
+
+    @abstractmethod
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+
+class StdlibJSONCodec(JSONCodec):
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Requires orjson. Falls back to stdlib json for documents orjson rejects, like integers over 64 bits
+    """
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._fallback = StdlibJSONCodec()
+
+    def __reduce__(self) -> tuple[type["OrjsonCodec"], tuple[()]]:
+        # module isn't picklable, so process pool workers create their own codec
+        return OrjsonCodec, ()
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            return self._fallback.decode(data)
+
+    def encode(self, value: Any) -> bytes:
+        try:
+            return self._orjson.dumps(value, option=self._orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return self._fallback.encode(value)
+
+
+def get_default_codec() -> JSONCodec:
+    """
+    Fastest available codec: orjson if it's installed, stdlib json otherwise
+    """
+
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return StdlibJSONCodec()
@@ -0,0 +1,147 @@
+import threading
+import weakref
+from datetime import datetime, timezone
+from http import HTTPStatus
+from time import monotonic, sleep
+from types import TracebackType
+from typing import Mapping, Self, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+THROTTLING_STATUSES = frozenset((HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE))
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """
+    Seconds to wait from Retry-After header, that's either delay in seconds or HTTP date
+    """
+
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimit:
+    """
+    Token bucket rate limit with cap on requests in flight. Used as context manager around request,
+    both sync and async. Threads share concurrency cap, asyncio tasks share it within their event loop.
+    Retry-After of 429 and 503 responses pauses all requests that go through the limit
+
+    :param rate: requests per second, no rate limit if None
+    :param burst: requests that can be sent at once after idle period
+    :param max_concurrency: max requests in flight, no limit if None
+    """
+
+    def __init__(self, rate: float | None = None, burst: int = 1, max_concurrency: int | None = None) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.tokens = float(burst)
+        self.updated_at = monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency is not None else None
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def reserve(self) -> float:
+        """
+        Takes token and returns seconds to wait before request can be sent
+        """
+
+        with self._lock:
+            now = monotonic()
+            delay = self.paused_until - now
+            if self.rate is not None:
+                self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    delay = max(delay, -self.tokens / self.rate)
+            return max(0.0, delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.paused_until = max(self.paused_until, monotonic() + seconds)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        if status_code in THROTTLING_STATUSES:
+            retry_after = parse_retry_after(headers)
+            if retry_after is not None:
+                self.pause(retry_after)
+
+    def _async_semaphore(self) -> "asyncio.Semaphore | None":
+        if self.max_concurrency is None:
+            return None
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def __enter__(self) -> Self:
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        delay = self.reserve()
+        if delay:
+            sleep(delay)
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def __aenter__(self) -> Self:
+        import asyncio
+
+        semaphore = self._async_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        delay = self.reserve()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+
+        semaphore = self._async_semaphore()
+        if semaphore is not None:
+            semaphore.release()
@@ -0,0 +1,202 @@
+import threading
+from bisect import bisect_left
+from enum import StrEnum
+from time import perf_counter
+from typing import Any, Sequence
+
+
+class Phase(StrEnum):
+    BIND = "bind"  # arguments binding, path and body building
+    NETWORK = "network"  # sending request and reading response, waiting for coalesced or cached one
+    DECODE = "decode"  # JSON decoding
+    PARSE = "parse"  # type alias conversion
+
+
+class RequestHook:
+    """
+    Base class for endpoint calls observers. Override methods you need, others do nothing.
+    Hooks are called synchronously on calling thread, so keep them cheap
+    """
+
+    def on_phase(self, endpoint: str, phase: Phase, seconds: float) -> None:
+        pass
+
+    def on_response(self, endpoint: str, status_code: int, size: int) -> None:
+        pass
+
+    def on_error(self, endpoint: str, phase: Phase, error: BaseException) -> None:
+        pass
+
+    def on_finish(self, endpoint: str, seconds: float) -> None:
+        pass
+
+
+class RequestObserver:
+    """
+    Times phases of single endpoint call and reports them to hooks. Phase lasts until next one is entered
+    """
+
+    def __init__(self, hooks: Sequence[RequestHook], endpoint: str) -> None:
+        self.hooks = hooks
+        self.endpoint = endpoint
+        self.phase = Phase.BIND
+        self.started_at = self.phase_started_at = perf_counter()
+
+    def _close_phase(self) -> float:
+        now = perf_counter()
+        for hook in self.hooks:
+            hook.on_phase(self.endpoint, self.phase, now - self.phase_started_at)
+        self.phase_started_at = now
+        return now
+
+    def enter(self, phase: Phase) -> None:
+        self._close_phase()
+        self.phase = phase
+
+    def response(self, status_code: int, size: int) -> None:
+        for hook in self.hooks:
+            hook.on_response(self.endpoint, status_code, size)
+
+    def finish(self) -> None:
+        now = self._close_phase()
+        for hook in self.hooks:
+            hook.on_finish(self.endpoint, now - self.started_at)
+
+    def fail(self, error: BaseException) -> None:
+        for hook in self.hooks:
+            hook.on_error(self.endpoint, self.phase, error)
+        self.finish()
+
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(float(4 ** power) for power in range(4, 13))  # 256B to 16MB
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, Prometheus style
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        with self._lock:
+            counts = list(self.counts)
+
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        return counts
+
+
+class MetricsRegistry(RequestHook):
+    """
+    In-process metrics of endpoint calls: phases latency and response size histograms,
+    calls and errors counters. Attach it to client with client.hooks.append(registry)
+
+    :param latency_buckets: upper bounds of phases latency histograms in seconds
+    :param size_buckets: upper bounds of responses size histograms in bytes
+    """
+
+    def __init__(
+            self,
+            latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+            size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ) -> None:
+
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self.phases: dict[tuple[str, Phase], Histogram] = {}
+        self.durations: dict[str, Histogram] = {}
+        self.response_sizes: dict[str, Histogram] = {}
+        self.errors: dict[tuple[str, Phase], int] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, histograms: dict[Any, Histogram], key: Any, buckets: Sequence[float]) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def on_phase(self, endpoint: str, phase: Phase, seconds: float) -> None:
+        self._histogram(self.phases, (endpoint, phase), self.latency_buckets).observe(seconds)
+
+    def on_response(self, endpoint: str, status_code: int, size: int) -> None:
+        self._histogram(self.response_sizes, endpoint, self.size_buckets).observe(size)
+
+    def on_error(self, endpoint: str, phase: Phase, error: BaseException) -> None:
+        with self._lock:
+            self.errors[endpoint, phase] = self.errors.get((endpoint, phase), 0) + 1
+
+    def on_finish(self, endpoint: str, seconds: float) -> None:
+        self._histogram(self.durations, endpoint, self.latency_buckets).observe(seconds)
+
+    def export_prometheus(self, prefix: str = "restmodels") -> str:
+        """
+        Renders all metrics in Prometheus text exposition format
+        """
+
+        # new endpoints add keys while calls run in other threads, so dicts are copied under lock before sorting
+        with self._lock:
+            phases = list(self.phases.items())
+            durations = list(self.durations.items())
+            response_sizes = list(self.response_sizes.items())
+            errors = list(self.errors.items())
+
+        lines: list[str] = []
+
+        lines += [f"# HELP {prefix}_phase_seconds Time spent in endpoint call phase",
+                  f"# TYPE {prefix}_phase_seconds histogram"]
+        for (endpoint, phase), histogram in sorted(phases):
+            lines += _histogram_lines(f"{prefix}_phase_seconds", {"endpoint": endpoint, "phase": phase}, histogram)
+
+        lines += [f"# HELP {prefix}_request_seconds Endpoint call duration",
+                  f"# TYPE {prefix}_request_seconds histogram"]
+        for endpoint, histogram in sorted(durations):
+            lines += _histogram_lines(f"{prefix}_request_seconds", {"endpoint": endpoint}, histogram)
+
+        lines += [f"# HELP {prefix}_response_bytes Response body size",
+                  f"# TYPE {prefix}_response_bytes histogram"]
+        for endpoint, histogram in sorted(response_sizes):
+            lines += _histogram_lines(f"{prefix}_response_bytes", {"endpoint": endpoint}, histogram)
+
+        lines += [f"# HELP {prefix}_errors_total Failed endpoint calls by failed phase",
+                  f"# TYPE {prefix}_errors_total counter"]
+        for (endpoint, phase), count in sorted(errors):
+            lines.append(f"{prefix}_errors_total{_format_labels({'endpoint': endpoint, 'phase': phase})} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+def _histogram_lines(name: str, labels: dict[str, str], histogram: Histogram) -> list[str]:
+    lines = []
+    bounds = [*histogram.buckets, float("inf")]
+    for bound, count in zip(bounds, histogram.cumulative_counts()):
+        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}")
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
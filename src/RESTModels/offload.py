@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .clients import Response
+from .json_codecs import JSONCodec
+from .parsers.response_parsers import ResponseParser
+from .parsers.interning import StringInterner
+from .parsers.type_alias_parsers import TypeAliasParser
+
+
+class ParseOffload:
+    """
+    Decodes and converts large responses of async endpoints in executor, so event loop keeps serving
+    other requests meanwhile. Thread pool is enough to keep loop responsive, process pool also parses
+    in parallel, but response type must be picklable and result is pickled back to the loop
+
+    :param min_size: response size in bytes from which parsing is offloaded, smaller responses are parsed on loop
+    :param executor: thread or process pool, own thread pool if None
+    :param max_workers: threads of own pool
+    """
+
+    def __init__(
+            self,
+            min_size: int = 1024 * 1024,
+            executor: Executor | None = None,
+            max_workers: int | None = None,
+    ) -> None:
+
+        self.min_size = min_size
+        self.max_workers = max_workers
+        self.offloaded = 0
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+            return self._executor
+
+    def accepts(self, response: Response) -> bool:
+        return len(response.content) >= self.min_size
+
+    async def parse(
+            self,
+            response: Response,
+            expected_type: Any,
+            parse: Callable[[Response], Any],
+            intern_strings: StringInterner | None = None,
+    ) -> Any:
+        """
+        Runs parse of response in executor. Process pool gets raw bytes and parses them with its own parser
+        """
+
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        self.offloaded += 1
+        if isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(
+                executor,
+                parse_content,
+                response.content,
+                response.codec,
+                expected_type,
+                intern_strings,
+            )
+        return await loop.run_in_executor(executor, parse, response)
+
+
+_worker_parser: ResponseParser | None = None
+
+
+def parse_content(
+        content: bytes,
+        codec: JSONCodec,
+        expected_type: Any,
+        intern_strings: StringInterner | None = None,
+) -> Any:
+    """
+    Decodes and converts response body in process pool worker. Converters are cached per worker process.
+    Interned strings stay shared after result is pickled back, since pickle keeps shared references
+    """
+
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResponseParser(TypeAliasParser())
+
+    value = codec.decode(content)
+    if intern_strings is not None:
+        value = intern_strings(value)
+    return _worker_parser(value, expected_type)
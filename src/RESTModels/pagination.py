@@ -0,0 +1,286 @@
+import queue
+import re
+import threading
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterator
+from urllib.parse import urlsplit, parse_qsl
+
+from .clients import Response
+
+
+LINK_NEXT_PATTERN = re.compile(r'<([^>]*)>[^,]*;\s*rel="?next"?')
+
+PageRequest = tuple[str, dict[str, Any]]  # path and query params
+Page = tuple[list[Any], PageRequest | None]  # converted items and next page request
+
+
+class PageError(Exception):
+    """
+    Page request failed with error status after retries, so listing isn't cut short silently
+
+    :param response: error response of the page
+    :param path: path of the failed page
+    """
+
+    def __init__(self, response: Response, path: str) -> None:
+        super().__init__(f"Page {path} failed with status {response.status_code}")
+        self.response = response
+        self.path = path
+
+
+def check_page(response: Response, path: str) -> None:
+    if not HTTPStatus.OK <= response.status_code < HTTPStatus.MULTIPLE_CHOICES:
+        raise PageError(response, path)
+
+
+def get_field(value: Any, field_path: str | None) -> Any:
+    """
+    Gets nested field by dotted path like "meta.next_cursor", whole value for None path
+    """
+
+    if field_path is None:
+        return value
+
+    for name in field_path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+class Pagination(ABC):
+    """
+    Pagination scheme: where page items are and how to request next page
+
+    :param items: dotted path to items list in page, None if page is list itself
+    """
+
+    def __init__(self, items: str | None = None) -> None:
+        self.items = items
+
+    def first_params(self, params: dict[str, Any]) -> dict[str, Any]:
+        return params
+
+    def get_items(self, page: Any) -> list[Any]:
+        return get_field(page, self.items) or []
+
+    @abstractmethod
+    def next_request(
+            self,
+            page: Any,
+            response: Response,
+            path: str,
+            params: dict[str, Any],
+            api_url: str,
+    ) -> PageRequest | None:
+        """
+        Request of the next page, None for the last page
+        """
+
+        raise NotImplementedError
+
+
+class CursorPagination(Pagination):
+    """
+    Next page is requested with cursor from current page
+
+    :param cursor_param: query param to send cursor in
+    :param next_cursor: dotted path to next page cursor in page, empty cursor means last page
+    """
+
+    def __init__(
+            self,
+            items: str | None = "data",
+            cursor_param: str = "cursor",
+            next_cursor: str = "next_cursor",
+    ) -> None:
+
+        super().__init__(items)
+        self.cursor_param = cursor_param
+        self.next_cursor = next_cursor
+
+    def next_request(
+            self,
+            page: Any,
+            response: Response,
+            path: str,
+            params: dict[str, Any],
+            api_url: str,
+    ) -> PageRequest | None:
+
+        cursor = get_field(page, self.next_cursor)
+        if cursor is None or cursor == "":
+            return None
+        return path, {**params, self.cursor_param: cursor}
+
+
+class OffsetPagination(Pagination):
+    """
+    Next page is requested with offset moved by items count. Page shorter than limit is the last one
+
+    :param offset_param: query param to send offset in
+    :param limit_param: query param to send page size in
+    :param limit: page size
+    """
+
+    def __init__(
+            self,
+            items: str | None = None,
+            offset_param: str = "offset",
+            limit_param: str = "limit",
+            limit: int = 100,
+    ) -> None:
+
+        super().__init__(items)
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.limit = limit
+
+    def first_params(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {self.limit_param: self.limit, **params}
+
+    def next_request(
+            self,
+            page: Any,
+            response: Response,
+            path: str,
+            params: dict[str, Any],
+            api_url: str,
+    ) -> PageRequest | None:
+
+        items_count = len(self.get_items(page))
+        if items_count < int(params.get(self.limit_param, self.limit)) or items_count == 0:
+            return None
+        return path, {**params, self.offset_param: int(params.get(self.offset_param, 0)) + items_count}
+
+
+class LinkPagination(Pagination):
+    """
+    Next page URL is taken from Link header with rel="next", like in GitHub API
+    """
+
+    def next_request(
+            self,
+            page: Any,
+            response: Response,
+            path: str,
+            params: dict[str, Any],
+            api_url: str,
+    ) -> PageRequest | None:
+
+        match = LINK_NEXT_PATTERN.search(response.headers.get("Link", ""))
+        if match is None:
+            return None
+
+        next_url = match.group(1)
+        if next_url.startswith(api_url):
+            next_url = next_url[len(api_url):]
+        url = urlsplit(next_url)
+        return url.path, dict(parse_qsl(url.query))
+
+
+def iter_pages(
+        fetch_page: Callable[[str, dict[str, Any]], Page],
+        first_request: PageRequest,
+        prefetch: int,
+) -> Iterator[Any]:
+    """
+    Iterates over items of all pages. With prefetch > 0 background thread fetches up to prefetch pages ahead
+    """
+
+    if prefetch <= 0:
+        request: PageRequest | None = first_request
+        while request is not None:
+            items, request = fetch_page(*request)
+            yield from items
+        return
+
+    pages: queue.Queue[Page | BaseException] = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def fetch_pages() -> None:
+        request: PageRequest | None = first_request
+        try:
+            while request is not None and not stopped.is_set():
+                page = fetch_page(*request)
+                request = page[1]
+                _put_until_stopped(pages, page, stopped)
+        except BaseException as error:
+            _put_until_stopped(pages, error, stopped)
+
+    thread = threading.Thread(target=fetch_pages, daemon=True, name="page-prefetch")
+    thread.start()
+    try:
+        while True:
+            page = pages.get()
+            if isinstance(page, BaseException):
+                raise page
+
+            items, next_request = page
+            yield from items
+            if next_request is None:
+                return
+    finally:
+        stopped.set()
+
+
+def _put_until_stopped(
+        pages: "queue.Queue[Page | BaseException]",
+        page: Page | BaseException,
+        stopped: threading.Event,
+) -> None:
+
+    while not stopped.is_set():
+        try:
+            pages.put(page, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+async def aiter_pages(
+        fetch_page: Callable[[str, dict[str, Any]], Awaitable[Page]],
+        first_request: PageRequest,
+        prefetch: int,
+) -> AsyncGenerator[Any, None]:
+    """
+    Async version of iter_pages, prefetching is done by background task
+    """
+
+    import asyncio
+
+    if prefetch <= 0:
+        request: PageRequest | None = first_request
+        while request is not None:
+            items, request = await fetch_page(*request)
+            for item in items:
+                yield item
+        return
+
+    pages: asyncio.Queue[Page | BaseException] = asyncio.Queue(maxsize=prefetch)
+
+    async def fetch_pages() -> None:
+        request: PageRequest | None = first_request
+        try:
+            while request is not None:
+                page = await fetch_page(*request)
+                request = page[1]
+                await pages.put(page)
+        except Exception as error:
+            await pages.put(error)
+
+    task = asyncio.create_task(fetch_pages())
+    try:
+        while True:
+            page = await pages.get()
+            if isinstance(page, BaseException):
+                raise page
+
+            items, next_request = page
+            for item in items:
+                yield item
+            if next_request is None:
+                return
+    finally:
+        task.cancel()
@@ -8,6 +8,5 @@ def get_args_dict(
 ) -> dict[str, Any]:
 
     params = {**kwargs}
-    for i, param in enumerate(function_args_names):
-        params[param] = args[i]
+    params.update(zip(function_args_names, args))
     return params
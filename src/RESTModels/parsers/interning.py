@@ -0,0 +1,69 @@
+from typing import Any
+
+from .type_alias_parsers import TypeConverter
+
+
+class StringInterner:
+    """
+    Makes equal strings of one decoded response share single object: dict keys and short values,
+    like enum-like statuses repeated in every list item. Memo lives only while response is parsed
+    and holds at most max_strings strings, so responses with mostly distinct strings cost one pass only.
+    Lists and dicts of decoded response are updated in place
+
+    :param max_length: longest string that's interned, longer ones are rarely repeated
+    :param max_strings: max distinct strings kept in memo of one response
+    """
+
+    def __init__(self, max_length: int = 64, max_strings: int = 10_000) -> None:
+        self.max_length = max_length
+        self.max_strings = max_strings
+
+    def __call__(self, value: Any) -> Any:
+        return self.start()(value)
+
+    def start(self) -> TypeConverter:
+        """
+        Interning function with fresh memo, for response that's decoded in parts, like stream items
+        """
+
+        memo: dict[str, str] = {}
+        max_length = self.max_length
+        max_strings = self.max_strings
+
+        def intern_string(string: str) -> str:
+            if len(string) > max_length:
+                return string
+
+            interned = memo.get(string)
+            if interned is not None:
+                return interned
+            if len(memo) < max_strings:
+                memo[string] = string
+            return string
+
+        def intern_value(value: Any) -> Any:
+            if isinstance(value, str):
+                return intern_string(value)
+
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, (str, list, dict)):
+                        value[i] = intern_value(item)
+                return value
+
+            if isinstance(value, dict):
+                keys_shared = True
+                for key, item in value.items():
+                    if isinstance(key, str) and intern_string(key) is not key:
+                        keys_shared = False
+                    if isinstance(item, (str, list, dict)):
+                        value[key] = intern_value(item)  # replacing value of existing key is safe while iterating
+
+                # decoders usually share keys already, dict is rebuilt only when they don't
+                if keys_shared:
+                    return value
+                return {intern_string(key) if isinstance(key, str) else key: item for key, item in value.items()}
+
+            return value
+
+        return intern_value
@@ -0,0 +1,109 @@
+from collections.abc import Sequence, Mapping
+from typing import Any, Iterator, overload, get_origin
+
+from .type_alias_parsers import TypeAliasParser, TypeConverter
+
+
+NOT_CONVERTED: Any = object()
+
+
+class LazyList(Sequence[Any]):
+    """
+    Read-only view over decoded JSON array. Items are converted on first access and memoized
+    """
+
+    __slots__ = ("_raw_items", "_items", "_convert_item")
+
+    def __init__(self, raw_items: list[Any], convert_item: TypeConverter) -> None:
+        self._raw_items = raw_items
+        self._items = [NOT_CONVERTED] * len(raw_items)
+        self._convert_item = convert_item
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        item = self._items[index]
+        if item is NOT_CONVERTED:
+            item = self._items[index] = self._convert_item(self._raw_items[index])
+        return item
+
+    def __len__(self) -> int:
+        return len(self._raw_items)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyList)):
+            return len(self) == len(other) and all(item == other_item for item, other_item in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class LazyDict(Mapping[Any, Any]):
+    """
+    Read-only view over decoded JSON object. Keys are converted at once, values - on first access and memoized
+    """
+
+    __slots__ = ("_raw_keys", "_raw_values", "_values", "_convert_value")
+
+    def __init__(self, raw_values: dict[Any, Any], convert_key: TypeConverter, convert_value: TypeConverter) -> None:
+        self._raw_keys = {convert_key(raw_key): raw_key for raw_key in raw_values}
+        self._raw_values = raw_values
+        self._values: dict[Any, Any] = {}
+        self._convert_value = convert_value
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = self._convert_value(self._raw_values[self._raw_keys[key]])
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._raw_keys)
+
+    def __len__(self) -> int:
+        return len(self._raw_keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def compile_lazy_alias(alias: Any, alias_parser: TypeAliasParser) -> TypeConverter:
+    """
+    Converter that returns lazy views for list and dict aliases on any depth. Other aliases are converted
+    by alias_parser when their container item is accessed
+    """
+
+    origin = get_origin(alias)
+    args: tuple[Any, ...] = getattr(alias, "__args__", ())
+
+    if origin is list and len(args) == 1:
+        convert_item = compile_lazy_alias(args[0], alias_parser)
+
+        def convert_list(value: Any) -> LazyList:
+            if not isinstance(value, list):
+                raise ValueError(f"Can't convert {type(value)} to {alias}")
+            return LazyList(value, convert_item)
+
+        return convert_list
+
+    if origin is dict and len(args) == 2:
+        convert_key = alias_parser.compile(args[0])
+        convert_value = compile_lazy_alias(args[1], alias_parser)
+
+        def convert_dict(value: Any) -> LazyDict:
+            if not isinstance(value, dict):
+                raise ValueError(f"Can't convert {type(value)} to {alias}")
+            return LazyDict(value, convert_key, convert_value)
+
+        return convert_dict
+
+    return alias_parser.compile(alias)
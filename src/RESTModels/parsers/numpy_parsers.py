@@ -0,0 +1,38 @@
+from types import GenericAlias
+from typing import Any
+
+import numpy as np
+
+from .type_alias_parsers import TypeAliasParser, TypeConverter
+
+
+def get_dtype(alias: Any) -> np.dtype[Any] | None:
+    """
+    :return: dtype of ndarray[Shape, np.dtype[ScalarType]] alias, None if it's not declared
+    """
+
+    args: tuple[Any, ...] = getattr(alias, "__args__", ())
+    if len(args) != 2:
+        return None
+
+    dtype_args: tuple[Any, ...] = getattr(args[1], "__args__", ())
+    if len(dtype_args) != 1 or not (isinstance(dtype_args[0], type) and issubclass(dtype_args[0], np.generic)):
+        return None
+
+    dtype: np.dtype[Any] = np.dtype(dtype_args[0])
+    return dtype
+
+
+@TypeAliasParser.register_general_type_parser
+def ndarray_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> np.ndarray[Any, Any]:
+    return np.asarray(value, dtype=get_dtype(alias))
+
+
+@TypeAliasParser.register_type_compiler(ndarray_alias_parser)
+def compile_ndarray_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    dtype = get_dtype(alias)
+
+    def convert(value: Any) -> np.ndarray[Any, Any]:
+        return np.asarray(value, dtype=dtype)
+
+    return convert
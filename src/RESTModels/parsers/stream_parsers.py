@@ -0,0 +1,108 @@
+import codecs
+import json
+import re
+from enum import Enum, auto
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+ITEM_DELIMITERS = frozenset(" \t\n\r,]")
+
+
+class ArrayState(Enum):
+    BEFORE_ARRAY = auto()
+    BEFORE_FIRST_ITEM = auto()
+    BEFORE_ITEM = auto()
+    AFTER_ITEM = auto()
+    DONE = auto()
+
+
+class JSONArrayDecoder:
+    """
+    Incrementally decodes top-level JSON array fed by chunks of bytes. Keeps only not decoded tail in memory
+    """
+
+    def __init__(self) -> None:
+        self.state = ArrayState.BEFORE_ARRAY
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        self._buffer = self._buffer[self._position:] + self._text_decoder.decode(chunk)
+        self._position = 0
+        return self._decode_items(final=False)
+
+    def close(self) -> list[Any]:
+        self._buffer = self._buffer[self._position:] + self._text_decoder.decode(b"", final=True)
+        self._position = 0
+        items = self._decode_items(final=True)
+
+        if self.state is not ArrayState.DONE:
+            raise ValueError("Response ended before end of JSON array")
+
+        return items
+
+    def _decode_items(self, final: bool) -> list[Any]:
+        items: list[Any] = []
+        buffer = self._buffer
+        buffer_end = len(buffer)
+        position = self._position
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()  # type: ignore[union-attr]
+            if position == buffer_end:
+                break
+
+            char = buffer[position]
+            match self.state:
+                case ArrayState.BEFORE_ARRAY if char == "[":
+                    self.state = ArrayState.BEFORE_FIRST_ITEM
+                    position += 1
+
+                case ArrayState.BEFORE_FIRST_ITEM | ArrayState.AFTER_ITEM if char == "]":
+                    self.state = ArrayState.DONE
+                    position += 1
+
+                case ArrayState.AFTER_ITEM if char == ",":
+                    self.state = ArrayState.BEFORE_ITEM
+                    position += 1
+
+                case ArrayState.BEFORE_FIRST_ITEM | ArrayState.BEFORE_ITEM:
+                    try:
+                        item, item_end = self._decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if final:
+                            raise
+                        break
+
+                    # number can continue in next chunk: "12" + "34", "1" + ".5"
+                    if not final and (item_end == buffer_end or buffer[item_end] not in ITEM_DELIMITERS):
+                        break
+
+                    items.append(item)
+                    self.state = ArrayState.AFTER_ITEM
+                    position = item_end
+
+                case _:
+                    raise ValueError(f"Unexpected {char!r} in JSON array stream at {self.state.name}")
+
+        self._position = position
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    decoder = JSONArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    decoder = JSONArrayDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
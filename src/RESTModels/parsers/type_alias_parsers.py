@@ -1,10 +1,17 @@
+import re
 from inspect import get_annotations
 from decimal import Decimal
-from typing import Any, TypeVar, get_origin, Protocol, cast, Union
+from typing import Any, TypeVar, get_origin, Protocol, cast, Union, Callable, get_type_hints, is_typeddict
+from typing import Literal, Annotated, get_args
+from dataclasses import fields, is_dataclass, MISSING
+from enum import Enum
 from datetime import datetime, date, time, timedelta
 from collections import ChainMap
-from types import GenericAlias
+from types import GenericAlias, NoneType, UnionType
 from itertools import zip_longest
+from functools import partial
+from importlib import import_module
+from array import array
 
 
 class TypeParserProtocol(Protocol):
@@ -24,45 +31,250 @@ class TypeParserProtocol(Protocol):
         raise NotImplementedError
 
 
+TypeConverter = Callable[[Any], Any]
+
+
+class TypeCompilerProtocol(Protocol):
+    def __call__(
+            self,
+            alias: GenericAlias,
+            alias_parser: "TypeAliasParser",
+    ) -> TypeConverter:
+        """
+        :param alias: GenericAlias that describes expected result type
+        :param alias_parser: TypeAliasParser object that compiles alias. Use alias_parser.compile for nested types
+        :return: converter that does the same as type parser, but for single value argument
+        """
+
+        raise NotImplementedError
+
+
 T = TypeVar("T")
+ParserT = TypeVar("ParserT", bound=TypeParserProtocol)
+
+
+FamilyPredicate = Callable[[Any], bool]
 
 
 class TypeAliasParser:
     general_types_parsers: dict[GenericAlias, TypeParserProtocol] = {}
+    general_families_parsers: dict[FamilyPredicate, TypeParserProtocol] = {}
+    types_compilers: dict[TypeParserProtocol, TypeCompilerProtocol] = {}
+    general_registry_version = 0
+
+    # Parsers for types of optional packages. Module is imported on first alias of type from package
+    lazy_parsers_modules: dict[str, str] = {
+        "numpy": "RESTModels.parsers.numpy_parsers",
+    }
 
     def __init__(self) -> None:
-        print(self.general_types_parsers)
         self.types_parsers: dict[GenericAlias, TypeParserProtocol] = {}
+        self.compiled_types: dict[Any, tuple[Any, TypeConverter]] = {}
+        self.resolved_parsers: dict[Any, TypeParserProtocol | None] = {}
+        self.compiled_registry_version = TypeAliasParser.general_registry_version
+        self.registry_version = 0
+
+    @property
+    def registry_state(self) -> tuple[int, int]:
+        """
+        Changes when parsers of this parser or general parsers are registered, so converters compiled
+        outside of compile() know they're outdated
+        """
+
+        return TypeAliasParser.general_registry_version, self.registry_version
 
-    def register_type_parser(self, parser: TypeParserProtocol) -> None:
+    def register_type_parser(self, parser: ParserT) -> ParserT:
         expected_type_alias = get_annotations(parser)["return"]
         expected_type = get_origin(expected_type_alias) or expected_type_alias
         self.types_parsers[expected_type] = parser
+        self.compiled_types.clear()
+        self.resolved_parsers.clear()
+        self.registry_version += 1
+        return parser
 
     @classmethod
-    def register_general_type_parser(cls, parser: TypeParserProtocol) -> None:
+    def register_general_type_parser(cls, parser: ParserT) -> ParserT:
         expected_type_alias = get_annotations(parser)["return"]
         expected_type = get_origin(expected_type_alias) or expected_type_alias
         cls.general_types_parsers[expected_type] = parser
+        TypeAliasParser.general_registry_version += 1
+        return parser
+
+    @classmethod
+    def register_general_family_parser(cls, is_family_member: FamilyPredicate) -> Callable[[ParserT], ParserT]:
+        """
+        Registers parser for all types that is_family_member returns True for, like all dataclasses.
+        Used when there is no parser for exact type
+        """
+
+        def decorator(parser: ParserT) -> ParserT:
+            cls.general_families_parsers[is_family_member] = parser
+            TypeAliasParser.general_registry_version += 1
+            return parser
+
+        return decorator
+
+    @classmethod
+    def register_type_compiler(
+            cls,
+            parser: TypeParserProtocol,
+    ) -> Callable[[TypeCompilerProtocol], TypeCompilerProtocol]:
+        """
+        Registers compiled equivalent of type parser. Compiler is used only while its parser is registered
+        """
+
+        def decorator(compiler: TypeCompilerProtocol) -> TypeCompilerProtocol:
+            cls.types_compilers[parser] = compiler
+            TypeAliasParser.general_registry_version += 1
+            return compiler
+
+        return decorator
 
     def __call__(self, value: Any, type_: Any) -> Any:
-        if isinstance(type_, type) and isinstance(value, type_):
-            return value
+        return self.compile(type_)(value)
 
-        type_alias = cast(GenericAlias, type_)
+    def compile(self, type_: Any) -> TypeConverter:
+        """
+        Turns type alias into converter once and caches it per alias
+        """
 
-        parsers = ChainMap(self.types_parsers, self.general_types_parsers)
+        if self.compiled_registry_version != TypeAliasParser.general_registry_version:
+            self.compiled_types.clear()
+            self.resolved_parsers.clear()
+            self.compiled_registry_version = TypeAliasParser.general_registry_version
+
+        try:
+            compiled_alias, converter = self.compiled_types[type_]
+        except KeyError:
+            return self._compile_cached(type_)
+        except TypeError:  # unhashable alias
+            return self._compile(type_)
+
+        # Union[int, str] == Union[str, int], but members order matters for parsing
+        if compiled_alias is type_ or _is_same_alias(compiled_alias, type_):
+            return converter
+
+        return self._compile(type_)
+
+    def _compile_cached(self, type_: Any) -> TypeConverter:
+        # Recursive types (tree node with list of nodes) get forward converter while they're compiled
+        compiled_converters: list[TypeConverter] = []
+
+        def forward_converter(value: Any) -> Any:
+            if not compiled_converters:  # called from other thread before compilation ended
+                return self._compile(type_)(value)
+            return compiled_converters[0](value)
+
+        self.compiled_types[type_] = (type_, forward_converter)
+        try:
+            converter = self._compile(type_)
+        except BaseException:
+            self.compiled_types.pop(type_, None)
+            raise
+
+        compiled_converters.append(converter)
+        self.compiled_types[type_] = (type_, converter)
+        return converter
+
+    def _compile(self, type_: Any) -> TypeConverter:
+        type_alias = cast(GenericAlias, type_)
 
         most_general_type = cast(GenericAlias, get_origin(type_alias) or type_alias)
 
+        parser = self._find_parser(most_general_type)
+
+        converter: TypeConverter
+        if parser is None:
+            converter = partial(_raise_missing_parser, type_alias=type_alias, alias_parser=self)
+        elif parser in self.types_compilers:
+            converter = self.types_compilers[parser](type_alias, self)
+        else:
+            converter = partial(parser, alias=type_alias, alias_parser=self)
+
+        # TypedDict doesn't support isinstance
+        if isinstance(type_, type) and not is_typeddict(type_):
+            return _skip_instances(type_, converter)
+
+        return converter
+
+    def _find_parser(self, most_general_type: GenericAlias) -> TypeParserProtocol | None:
+        """
+        Parser of exact type, then of family type belongs to, then of nearest base class in MRO.
+        Result is cached per type until registries change
+        """
+
+        try:
+            return self.resolved_parsers[most_general_type]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable type
+            return self._resolve_parser(most_general_type)
+
+        parser = self.resolved_parsers[most_general_type] = self._resolve_parser(most_general_type)
+        return parser
+
+    def _resolve_parser(self, most_general_type: GenericAlias) -> TypeParserProtocol | None:
+        parsers = ChainMap(self.types_parsers, self.general_types_parsers)
+
         if most_general_type not in parsers:
-            raise ValueError(
-                f"Has not type parser (TypeParser) for type {type_alias}. "
-                f"Perhaps you forgot {self}.register(expected_type, type_parser)?"
-            )
+            self._load_lazy_parsers(most_general_type)
+
+        if most_general_type in parsers:
+            return parsers[most_general_type]
+
+        for is_family_member, parser in reversed(self.general_families_parsers.items()):
+            if is_family_member(most_general_type):
+                return parser
+
+        # families go first, so IntEnum gets enum parser instead of int one
+        for base in getattr(most_general_type, "__mro__", ())[1:]:
+            if base in parsers:
+                return parsers[base]
+
+        return None
+
+    @classmethod
+    def _load_lazy_parsers(cls, type_: Any) -> None:
+        package = getattr(type_, "__module__", "").partition(".")[0]
+        parsers_module = cls.lazy_parsers_modules.pop(package, None)
+        if parsers_module is not None:
+            import_module(parsers_module)
+
+
+def _is_same_alias(first: Any, second: Any) -> bool:
+    if first is second:
+        return True
+
+    first_args = getattr(first, "__args__", None)
+    second_args = getattr(second, "__args__", None)
+    if first_args is None or second_args is None:
+        return type(first) is type(second) and bool(first == second)
+
+    return (
+        get_origin(first) is get_origin(second)
+        and len(first_args) == len(second_args)
+        and all(_is_same_alias(first_arg, second_arg) for first_arg, second_arg in zip(first_args, second_args))
+    )
+
+
+def _skip_instances(type_: type[Any], converter: TypeConverter) -> TypeConverter:
+    def convert_if_not_instance(value: Any) -> Any:
+        if isinstance(value, type_):
+            return value
+        return converter(value)
+
+    return convert_if_not_instance
 
-        parser = parsers[most_general_type]
-        return parser(value, alias=type_alias, alias_parser=self)
+
+def _is_subclass(alias: Any, type_: type[Any]) -> bool:
+    return isinstance(alias, type) and alias is not type_ and issubclass(alias, type_)
+
+
+def _raise_missing_parser(value: Any, type_alias: GenericAlias, alias_parser: TypeAliasParser) -> Any:
+    raise ValueError(
+        f"Has not type parser (TypeParser) for type {type_alias}. "
+        f"Perhaps you forgot {alias_parser}.register(expected_type, type_parser)?"
+    )
 
 
 @TypeAliasParser.register_general_type_parser
@@ -120,9 +332,39 @@ def time_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasPa
 
 @TypeAliasParser.register_general_type_parser
 def timedelta_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> timedelta:
+    if isinstance(value, str):
+        return parse_iso_duration(value)
     return timedelta(value)
 
 
+_ISO_DURATION_NUMBER = r"(\d+(?:[.,]\d*)?)"
+ISO_DURATION_PATTERN = re.compile(
+    rf"([-+]?)P(?!$)(?:{_ISO_DURATION_NUMBER}W)?(?:{_ISO_DURATION_NUMBER}D)?"
+    rf"(?:T(?=\d)(?:{_ISO_DURATION_NUMBER}H)?(?:{_ISO_DURATION_NUMBER}M)?(?:{_ISO_DURATION_NUMBER}S)?)?"
+)
+
+
+def parse_iso_duration(value: str) -> timedelta:
+    """
+    Parses ISO 8601 duration like "P1DT2H30M" or "-PT0.5S". Years and months have no fixed length,
+    so durations with them are rejected
+    """
+
+    match = ISO_DURATION_PATTERN.fullmatch(value)
+    if match is None:
+        raise ValueError(f"{value!r} is not ISO 8601 duration in weeks, days, hours, minutes and seconds")
+
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=float(weeks.replace(",", ".")) if weeks else 0,
+        days=float(days.replace(",", ".")) if days else 0,
+        hours=float(hours.replace(",", ".")) if hours else 0,
+        minutes=float(minutes.replace(",", ".")) if minutes else 0,
+        seconds=float(seconds.replace(",", ".")) if seconds else 0,
+    )
+    return -duration if sign == "-" else duration
+
+
 @TypeAliasParser.register_general_type_parser
 def tuple_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> tuple[Any, ...]:
     if hasattr(alias, "__args__"):
@@ -163,6 +405,41 @@ def frozenset_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAl
     return frozenset(value)
 
 
+@TypeAliasParser.register_general_type_parser
+def dict_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> dict[Any, Any]:
+    if hasattr(alias, "__args__"):
+        key_type_alias, value_type_alias = alias.__args__
+        return {
+            alias_parser(key, key_type_alias): alias_parser(elem, value_type_alias)
+            for key, elem in value.items()
+        }
+
+    return dict(value)
+
+
+@TypeAliasParser.register_general_type_parser
+def array_alias_parser(
+        value: Any,
+        alias: GenericAlias,
+        alias_parser: TypeAliasParser,
+) -> array:  # type: ignore[type-arg]
+    """
+    Converts list of numbers into compact buffer in one pass: signed 64-bit ints if all numbers are ints,
+    64-bit floats otherwise
+    """
+
+    for typecode in ("q", "d"):
+        try:
+            return array(typecode, value)
+        except (TypeError, OverflowError):
+            continue
+
+    try:
+        return array("d", map(float, value))
+    except TypeError as error:
+        raise ValueError(f"Can't convert {type(value)} to array") from error
+
+
 @TypeAliasParser.register_general_type_parser
 def none_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> None:
     return
@@ -170,23 +447,685 @@ def none_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasPa
 
 @TypeAliasParser.register_general_type_parser
 def old_union_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Union[Any, str]:
-    if hasattr(alias, "__args__"):
-        for compatible_type_alias in alias.__args__:
-            try:
-                return alias_parser(value, compatible_type_alias)
-            except ValueError:
-                continue
-
-    raise ValueError
+    return compile_union_alias(alias, alias_parser)(value)
 
 
 @TypeAliasParser.register_general_type_parser
 def new_union_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Any | str:
-    if hasattr(alias, "__args__"):
-        for compatible_type_alias in alias.__args__:
+    return compile_union_alias(alias, alias_parser)(value)
+
+
+class Discriminator:
+    """
+    Annotated[Cat | Dog, Discriminator("kind")] picks union member by "kind" field of JSON object.
+    Members declare their values of the field with Literal annotation or dataclass field default
+    """
+
+    def __init__(self, field_name: str) -> None:
+        self.field_name = field_name
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.field_name!r})"
+
+
+class DateTimeFormat:
+    """
+    Annotated[datetime, DateTimeFormat("%d.%m.%Y %H:%M")] parses values of one strptime format only,
+    for APIs that send timestamps not in ISO 8601 or when values must follow strict layout.
+    Works for date and time too
+    """
+
+    def __init__(self, format: str) -> None:
+        self.format = format
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.format!r})"
+
+    def compile_parse(self, type_: Any) -> Callable[[str], Any]:
+        strptime = datetime.strptime
+        format_ = self.format
+
+        if type_ is datetime:
+            return lambda value: strptime(value, format_)
+        if type_ is date:
+            return lambda value: strptime(value, format_).date()
+        if type_ is time:
+            return lambda value: strptime(value, format_).timetz()
+        raise TypeError(f"DateTimeFormat is for datetime, date and time, got {type_}")
+
+
+@TypeAliasParser.register_general_type_parser
+def annotated_alias_parser(
+        value: Any,
+        alias: GenericAlias,
+        alias_parser: TypeAliasParser,
+) -> Annotated[Any, "Parsed as annotated type"]:
+
+    return compile_annotated_alias(alias, alias_parser)(value)
+
+
+@TypeAliasParser.register_general_type_parser
+def literal_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Literal["Any literal"]:
+    return compile_literal_alias(alias, alias_parser)(value)  # type: ignore[no-any-return]
+
+
+def _compile_type_call(type_: type[Any]) -> TypeCompilerProtocol:
+    def compile_type_call(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+        if _is_subclass(alias, type_):  # subclass found by parser of its base is created by its own constructor
+            return cast(TypeConverter, alias)
+        return type_
+
+    return compile_type_call
+
+
+TypeAliasParser.register_type_compiler(str_alias_parser)(_compile_type_call(str))
+TypeAliasParser.register_type_compiler(int_alias_parser)(_compile_type_call(int))
+TypeAliasParser.register_type_compiler(bool_alias_parser)(_compile_type_call(bool))
+TypeAliasParser.register_type_compiler(float_alias_parser)(_compile_type_call(float))
+TypeAliasParser.register_type_compiler(decimal_alias_parser)(_compile_type_call(Decimal))
+
+
+def _compile_from_isoformat(type_: type[date]) -> TypeCompilerProtocol:
+    def compile_from_isoformat(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+        from_isoformat = cast(type[date], alias).fromisoformat if _is_subclass(alias, type_) else type_.fromisoformat
+
+        def convert(value: Any) -> Any:
+            if isinstance(value, str):
+                return from_isoformat(value)
+            raise ValueError
+
+        return convert
+
+    return compile_from_isoformat
+
+
+TypeAliasParser.register_type_compiler(datetime_alias_parser)(_compile_from_isoformat(datetime))
+TypeAliasParser.register_type_compiler(date_alias_parser)(_compile_from_isoformat(date))
+
+ISO_FORMAT_PARSERS: tuple[TypeParserProtocol, ...] = (datetime_alias_parser, date_alias_parser, time_alias_parser)
+
+
+@TypeAliasParser.register_type_compiler(bytes_alias_parser)
+def compile_bytes_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    def convert(value: Any) -> bytes:
+        if isinstance(value, str):
+            return value.encode(encoding="utf-8")
+        raise ValueError
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(timedelta_alias_parser)
+def compile_timedelta_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    def convert(value: Any) -> timedelta:
+        if isinstance(value, str):
+            return parse_iso_duration(value)
+        return timedelta(value)
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(time_alias_parser)
+def compile_time_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    def convert(value: Any) -> time:
+        if isinstance(value, str):
+            return time.fromisoformat(value)
+        return time(value)
+
+    return convert
+
+
+def _compile_container_subclass(
+        alias: Any,
+        type_: type[Any],
+        compile_container: TypeCompilerProtocol,
+        alias_parser: TypeAliasParser,
+) -> TypeConverter:
+    """
+    Subclass of container found by parser of its base, like class Tags(list[str]), converts value
+    as its parametrized base and is created by its own constructor
+    """
+
+    base: Any = next((base for base in getattr(alias, "__orig_bases__", ()) if get_origin(base) is type_), type_)
+    convert = compile_container(base, alias_parser)
+
+    def convert_subclass(value: Any) -> Any:
+        return alias(convert(value))
+
+    return convert_subclass
+
+
+@TypeAliasParser.register_type_compiler(tuple_alias_parser)
+def compile_tuple_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    if _is_subclass(alias, tuple):
+        return _compile_container_subclass(alias, tuple, compile_tuple_alias, alias_parser)
+
+    if not hasattr(alias, "__args__"):
+        return tuple
+
+    if len(alias.__args__) == 2 and alias.__args__[1] is Ellipsis:
+        convert_elem = alias_parser.compile(alias.__args__[0])
+
+        def convert_variadic(value: Any) -> tuple[Any, ...]:
+            return tuple(map(convert_elem, value))
+
+        return convert_variadic
+
+    elems_converters = tuple(alias_parser.compile(elem_type) for elem_type in alias.__args__)
+
+    def convert(value: Any) -> tuple[Any, ...]:
+        elems = tuple(value)
+        if len(elems) != len(elems_converters):
+            raise ValueError
+        return tuple(convert_elem(elem) for convert_elem, elem in zip(elems_converters, elems))
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(list_alias_parser)
+def compile_list_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    if _is_subclass(alias, list):
+        return _compile_container_subclass(alias, list, compile_list_alias, alias_parser)
+
+    if not hasattr(alias, "__args__"):
+        return list
+
+    convert_elem = alias_parser.compile(alias.__args__[0])
+    parse_string = get_string_parser(alias.__args__[0], alias_parser)
+    if parse_string is None:
+        def convert(value: Any) -> list[Any]:
+            return list(map(convert_elem, value))
+
+        return convert
+
+    def convert_strings(value: Any) -> list[Any]:
+        try:
+            return _convert_strings(parse_string, value)
+        except TypeError:  # not all items are strings, like time given as hour number
+            return list(map(convert_elem, value))
+
+    return convert_strings
+
+
+def get_string_parser(alias: Any, alias_parser: TypeAliasParser) -> Callable[[str], Any] | None:
+    """
+    Parser of single string for datetime, date and time aliases with builtin parsers, None for other aliases.
+    Lists of them are converted by it without per item type checks
+    """
+
+    if get_origin(alias) is Annotated:
+        for metadata in alias.__metadata__:
+            if isinstance(metadata, DateTimeFormat):
+                return metadata.compile_parse(alias.__origin__)
+        return None
+
+    if isinstance(alias, type) and alias_parser._find_parser(cast(GenericAlias, alias)) in ISO_FORMAT_PARSERS:
+        return cast(type[date], alias).fromisoformat
+    return None
+
+
+STRINGS_MEMO_SAMPLE = 256
+STRINGS_MEMO_SIZE = 1024
+
+
+def _convert_strings(parse_string: Callable[[str], Any], value: list[Any]) -> list[Any]:
+    """
+    Converts whole list by one map call. When its first items repeat, like timestamps of events feed,
+    repeated strings are converted once with small memo instead
+    """
+
+    sample = value[:STRINGS_MEMO_SAMPLE]
+    if len(set(sample)) * 2 > len(sample):  # mostly distinct, memo would only slow down
+        return list(map(parse_string, value))
+
+    memo: dict[str, Any] = {}
+    converted = []
+    for item in value:
+        result = memo.get(item)
+        if result is None:
+            result = parse_string(item)
+            if len(memo) < STRINGS_MEMO_SIZE:
+                memo[item] = result
+        converted.append(result)
+    return converted
+
+
+@TypeAliasParser.register_type_compiler(set_alias_parser)
+def compile_set_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    if _is_subclass(alias, set):
+        return _compile_container_subclass(alias, set, compile_set_alias, alias_parser)
+
+    if not hasattr(alias, "__args__"):
+        return set
+
+    convert_elem = alias_parser.compile(alias.__args__[0])
+
+    def convert(value: Any) -> set[Any]:
+        return set(map(convert_elem, value))
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(frozenset_alias_parser)
+def compile_frozenset_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    if _is_subclass(alias, frozenset):
+        return _compile_container_subclass(alias, frozenset, compile_frozenset_alias, alias_parser)
+
+    if not hasattr(alias, "__args__"):
+        return frozenset
+
+    convert_elem = alias_parser.compile(alias.__args__[0])
+
+    def convert(value: Any) -> frozenset[Any]:
+        return frozenset(map(convert_elem, value))
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(dict_alias_parser)
+def compile_dict_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    if _is_subclass(alias, dict):
+        return _compile_container_subclass(alias, dict, compile_dict_alias, alias_parser)
+
+    if not hasattr(alias, "__args__"):
+        return dict
+
+    key_type_alias, value_type_alias = alias.__args__
+    convert_key = alias_parser.compile(key_type_alias)
+    convert_elem = alias_parser.compile(value_type_alias)
+
+    def convert(value: Any) -> dict[Any, Any]:
+        return {convert_key(key): convert_elem(elem) for key, elem in value.items()}
+
+    return convert
+
+
+@TypeAliasParser.register_type_compiler(array_alias_parser)
+def compile_array_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    return partial(array_alias_parser, alias=alias, alias_parser=alias_parser)
+
+
+@TypeAliasParser.register_type_compiler(none_alias_parser)
+def compile_none_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    def convert(value: Any) -> None:
+        return None
+
+    return convert
+
+
+JSON_KINDS = frozenset((NoneType, bool, int, float, str, list, dict))
+
+# JSON values types that type is naturally parsed from. Types that aren't here can be parsed from any JSON value
+TYPES_JSON_KINDS: dict[Any, frozenset[type]] = {
+    NoneType: frozenset((NoneType,)),
+    bool: frozenset((bool,)),
+    int: frozenset((int,)),
+    float: frozenset((int, float)),
+    Decimal: frozenset((int, float, str)),
+    str: frozenset((str,)),
+    bytes: frozenset((str,)),
+    datetime: frozenset((str,)),
+    date: frozenset((str,)),
+    time: frozenset((str, int)),
+    timedelta: frozenset((int, float)),
+    tuple: frozenset((list,)),
+    list: frozenset((list,)),
+    set: frozenset((list,)),
+    frozenset: frozenset((list,)),
+    array: frozenset((list,)),
+    dict: frozenset((dict,)),
+}
+
+
+def get_json_kinds(alias: Any) -> frozenset[type]:
+    if alias is None:
+        return TYPES_JSON_KINDS[NoneType]
+
+    origin = get_origin(alias) or alias
+    if origin in (Union, UnionType):
+        return frozenset().union(*map(get_json_kinds, get_args(alias)))
+    if origin is Annotated:
+        return get_json_kinds(alias.__origin__)
+    if origin is Literal:
+        return frozenset(_literal_value_type(literal) for literal in get_args(alias))
+    if is_enum_type(origin):
+        return frozenset(type(member.value) for member in origin)
+    if origin in TYPES_JSON_KINDS:
+        return TYPES_JSON_KINDS[origin]
+    if is_dataclass_type(origin) or is_typeddict(origin):
+        return TYPES_JSON_KINDS[dict]
+    if is_named_tuple_type(origin):
+        return TYPES_JSON_KINDS[dict] | TYPES_JSON_KINDS[list]
+
+    for base in getattr(origin, "__mro__", ())[1:]:
+        if base in TYPES_JSON_KINDS:
+            return TYPES_JSON_KINDS[base]
+
+    return JSON_KINDS
+
+
+def _literal_value_type(literal: Any) -> type:
+    return type(literal.value) if isinstance(literal, Enum) else type(literal)
+
+
+def compile_union_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    """
+    Dispatches on type of JSON value: members naturally parsed from it are tried first, others after them.
+    Members keep declared order inside both groups
+    """
+
+    if not hasattr(alias, "__args__"):
+        return _raise_value_error
+
+    members = [(get_json_kinds(member_alias), alias_parser.compile(member_alias)) for member_alias in alias.__args__]
+    all_members_converters = tuple(member_converter for _, member_converter in members)
+
+    dispatch_table = {}
+    for json_kind in JSON_KINDS:
+        natural_converters = [member_converter for kinds, member_converter in members if json_kind in kinds]
+        other_converters = [member_converter for kinds, member_converter in members if json_kind not in kinds]
+        dispatch_table[json_kind] = tuple(natural_converters + other_converters)
+
+    def convert(value: Any) -> Any:
+        for convert_member in dispatch_table.get(type(value), all_members_converters):
             try:
-                return alias_parser(value, compatible_type_alias)
-            except ValueError:
+                return convert_member(value)
+            except (ValueError, TypeError):
                 continue
 
+        raise ValueError(f"Can't convert {type(value)} to any of {alias}")
+
+    return convert
+
+
+def get_discriminator_values(member_alias: Any, field_name: str) -> tuple[Any, ...]:
+    field_type = get_type_hints(member_alias).get(field_name)
+    if get_origin(field_type) is Literal:
+        return get_args(field_type)
+
+    if is_dataclass_type(member_alias):
+        for field in fields(member_alias):
+            if field.name == field_name and field.default is not MISSING:
+                return (field.default,)
+
+    raise TypeError(f"{member_alias} has not Literal annotation or default for discriminator {field_name!r}")
+
+
+def compile_discriminated_union_alias(
+        alias: GenericAlias,
+        discriminator: Discriminator,
+        alias_parser: TypeAliasParser,
+) -> TypeConverter:
+
+    field_name = discriminator.field_name
+    members_converters = {
+        discriminator_value: alias_parser.compile(member_alias)
+        for member_alias in get_args(alias)
+        for discriminator_value in get_discriminator_values(member_alias, field_name)
+    }
+
+    def convert(value: Any) -> Any:
+        try:
+            convert_member = members_converters[value[field_name]]
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"Can't choose member of {alias} by {field_name!r} field") from error
+        return convert_member(value)
+
+    return convert
+
+
+def compile_annotated_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    annotated_alias = cast(GenericAlias, alias.__origin__)
+    for metadata in alias.__metadata__:
+        if isinstance(metadata, Discriminator) and get_origin(annotated_alias) in (Union, UnionType):
+            return compile_discriminated_union_alias(annotated_alias, metadata, alias_parser)
+        if isinstance(metadata, DateTimeFormat):
+            return _compile_strict_string(metadata.compile_parse(annotated_alias))
+
+    return alias_parser.compile(annotated_alias)
+
+
+def compile_literal_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    # Literal[1] != Literal[True], so key holds value type too
+    literals = {(type(literal), literal): literal for literal in get_args(alias)}
+    # enum members are sent by their values
+    literals.update({
+        (type(literal.value), literal.value): literal for literal in get_args(alias) if isinstance(literal, Enum)
+    })
+
+    def convert(value: Any) -> Any:
+        try:
+            return literals[type(value), value]
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"{value!r} is not one of {alias}") from error
+
+    return convert
+
+
+def compile_enum_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    enum_type = cast(type[Enum], alias)
+    members = {member.value: member for member in enum_type.__members__.values()}
+
+    def convert(value: Any) -> Any:
+        try:
+            return members[value]
+        except (KeyError, TypeError):
+            return enum_type(value)  # values that are equal to member value but not hashed with it, _missing_ hook
+
+    return convert
+
+
+def _compile_strict_string(parse_string: Callable[[str], Any]) -> TypeConverter:
+    def convert(value: Any) -> Any:
+        if isinstance(value, str):
+            return parse_string(value)
+        raise ValueError
+
+    return convert
+
+
+def _raise_value_error(value: Any) -> Any:
     raise ValueError
+
+
+TypeAliasParser.register_type_compiler(old_union_alias_parser)(compile_union_alias)
+TypeAliasParser.register_type_compiler(new_union_alias_parser)(compile_union_alias)
+TypeAliasParser.register_type_compiler(annotated_alias_parser)(compile_annotated_alias)
+TypeAliasParser.register_type_compiler(literal_alias_parser)(compile_literal_alias)
+
+
+def is_enum_type(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, Enum)
+
+
+@TypeAliasParser.register_general_family_parser(is_enum_type)
+def enum_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Enum:
+    return compile_enum_alias(alias, alias_parser)(value)  # type: ignore[no-any-return]
+
+
+TypeAliasParser.register_type_compiler(enum_alias_parser)(compile_enum_alias)
+
+
+def is_dataclass_type(type_: Any) -> bool:
+    return isinstance(type_, type) and is_dataclass(type_)
+
+
+def is_named_tuple_type(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, tuple) and hasattr(type_, "_fields")
+
+
+def _generate_converter(source: str, namespace: dict[str, Any], alias: Any) -> TypeConverter:
+    """
+    Builds converter from generated source, so object is created by one call without intermediate containers
+    """
+
+    namespace = {**namespace, "ValueError": ValueError, "KeyError": KeyError, "TypeError": TypeError}
+    exec(compile(source, f"<{getattr(alias, '__qualname__', alias)} converter>", "exec"), namespace)
+    return cast(TypeConverter, namespace["convert"])
+
+
+def get_alias_type_hints(alias: Any) -> dict[str, Any]:
+    """
+    Type hints of class, or of generic class alias like Box[int] with its type variables replaced by alias args
+    """
+
+    origin = get_origin(alias)
+    if origin is None:
+        return get_type_hints(alias)
+
+    type_vars = dict(zip(origin.__parameters__, alias.__args__))
+    return {name: _substitute_type_vars(hint, type_vars) for name, hint in get_type_hints(origin).items()}
+
+
+def _substitute_type_vars(hint: Any, type_vars: dict[Any, Any]) -> Any:
+    if isinstance(hint, TypeVar):
+        return type_vars.get(hint, hint)
+
+    parameters = getattr(hint, "__parameters__", ())
+    if not parameters:
+        return hint
+    return hint[tuple(type_vars.get(parameter, parameter) for parameter in parameters)]
+
+
+def _generate_fields_getters(
+        fields_names: list[str],
+        fields_types: dict[str, Any],
+        defaults: dict[str, Any],
+        factories: dict[str, Any],
+        alias_parser: TypeAliasParser,
+        namespace: dict[str, Any],
+        first_index: int = 0,
+) -> list[str]:
+
+    getters = []
+    for i, field_name in enumerate(fields_names, start=first_index):
+        namespace[f"convert_{i}"] = alias_parser.compile(fields_types[field_name])
+        getter = f"convert_{i}(value[{field_name!r}])"
+
+        if field_name in defaults:
+            namespace[f"default_{i}"] = defaults[field_name]
+            getter = f"({getter} if {field_name!r} in value else default_{i})"
+        elif field_name in factories:
+            namespace[f"factory_{i}"] = factories[field_name]
+            getter = f"({getter} if {field_name!r} in value else factory_{i}())"
+
+        getters.append(getter)
+
+    return getters
+
+
+def compile_dataclass_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    fields_types = get_alias_type_hints(alias)
+    cls: Any = get_origin(alias) or alias
+    init_fields = [field for field in fields(cls) if field.init]
+    fields_names = [field.name for field in init_fields]
+
+    namespace: dict[str, Any] = {"cls": cls}
+    getters = _generate_fields_getters(
+        fields_names,
+        fields_types,
+        {field.name: field.default for field in init_fields if field.default is not MISSING},
+        {field.name: field.default_factory for field in init_fields if field.default_factory is not MISSING},
+        alias_parser,
+        namespace,
+    )
+    arguments = ", ".join(f"{field_name}={getter}" for field_name, getter in zip(fields_names, getters))
+
+    source = (
+        "def convert(value):\n"
+        "    try:\n"
+        f"        return cls({arguments})\n"
+        "    except (KeyError, TypeError) as error:\n"
+        "        raise ValueError(f'Cannot convert {type(value)} to {cls}') from error\n"
+    )
+    return _generate_converter(source, namespace, alias)
+
+
+def compile_typed_dict_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    fields_types = get_alias_type_hints(alias)
+    cls: Any = get_origin(alias) or alias
+    required_keys = [key for key in fields_types if key in cls.__required_keys__]
+    optional_keys = [key for key in fields_types if key not in cls.__required_keys__]
+
+    namespace: dict[str, Any] = {}
+    getters = _generate_fields_getters(required_keys, fields_types, {}, {}, alias_parser, namespace)
+    items = ", ".join(f"{key!r}: {getter}" for key, getter in zip(required_keys, getters))
+
+    optional_getters = _generate_fields_getters(
+        optional_keys,
+        fields_types,
+        {},
+        {},
+        alias_parser,
+        namespace,
+        first_index=len(required_keys),
+    )
+    optional_items = "".join(
+        f"        if {key!r} in value:\n"
+        f"            result[{key!r}] = {getter}\n"
+        for key, getter in zip(optional_keys, optional_getters)
+    )
+
+    source = (
+        "def convert(value):\n"
+        "    try:\n"
+        f"        result = {{{items}}}\n"
+        f"{optional_items}"
+        "    except (KeyError, TypeError) as error:\n"
+        "        raise ValueError(f'Cannot convert {type(value)} to TypedDict') from error\n"
+        "    return result\n"
+    )
+    return _generate_converter(source, namespace, alias)
+
+
+def compile_named_tuple_alias(alias: GenericAlias, alias_parser: TypeAliasParser) -> TypeConverter:
+    fields_types = get_alias_type_hints(alias)
+    cls: Any = get_origin(alias) or alias
+    fields_names = list(cls._fields)
+    min_length = len(fields_names) - len(cls._field_defaults)
+
+    namespace: dict[str, Any] = {"cls": cls}
+    getters = _generate_fields_getters(
+        fields_names,
+        fields_types,
+        cls._field_defaults,
+        {},
+        alias_parser,
+        namespace,
+    )
+    arguments = ", ".join(f"{field_name}={getter}" for field_name, getter in zip(fields_names, getters))
+    positional_converters = "".join(f"convert_{i}, " for i in range(len(fields_names)))
+
+    # Named tuple can come as JSON object or as JSON array
+    source = (
+        "def convert(value):\n"
+        "    try:\n"
+        "        if isinstance(value, dict):\n"
+        f"            return cls({arguments})\n"
+        f"        if not {min_length} <= len(value) <= {len(fields_names)}:\n"
+        "            raise ValueError(f'Cannot convert {len(value)} items to {cls}')\n"
+        f"        return cls(*[convert_elem(elem) for convert_elem, elem in zip(({positional_converters}), value)])\n"
+        "    except (KeyError, TypeError) as error:\n"
+        "        raise ValueError(f'Cannot convert {type(value)} to {cls}') from error\n"
+    )
+    return _generate_converter(source, namespace, alias)
+
+
+@TypeAliasParser.register_general_family_parser(is_dataclass_type)
+def dataclass_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Any:
+    return compile_dataclass_alias(alias, alias_parser)(value)
+
+
+@TypeAliasParser.register_general_family_parser(is_typeddict)
+def typed_dict_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Any:
+    return compile_typed_dict_alias(alias, alias_parser)(value)
+
+
+@TypeAliasParser.register_general_family_parser(is_named_tuple_type)
+def named_tuple_alias_parser(value: Any, alias: GenericAlias, alias_parser: TypeAliasParser) -> Any:
+    return compile_named_tuple_alias(alias, alias_parser)(value)
+
+
+TypeAliasParser.register_type_compiler(dataclass_alias_parser)(compile_dataclass_alias)
+TypeAliasParser.register_type_compiler(typed_dict_alias_parser)(compile_typed_dict_alias)
+TypeAliasParser.register_type_compiler(named_tuple_alias_parser)(compile_named_tuple_alias)
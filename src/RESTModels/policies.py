@@ -0,0 +1,348 @@
+import random
+import threading
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from enum import Enum
+from http import HTTPMethod, HTTPStatus
+from time import monotonic, sleep
+from typing import Awaitable, Callable, Collection
+
+from .clients import Response
+from .limits import RateLimit, parse_retry_after
+
+
+IDEMPOTENT_METHODS = frozenset((HTTPMethod.GET, HTTPMethod.PUT, HTTPMethod.DELETE))
+ErrorTypes = tuple[type[BaseException], ...]
+
+
+class RetryPolicy:
+    """
+    Retries failed attempts with exponential backoff and full jitter:
+    attempt n waits random time in [0, min(max_backoff, backoff * 2 ** n)], or Retry-After if it's longer
+
+    :param attempts: max attempts including the first one
+    :param backoff: base delay in seconds
+    :param max_backoff: max delay in seconds
+    :param statuses: response statuses that are retried
+    :param errors: exceptions that are retried, client transient errors by default
+    """
+
+    def __init__(
+            self,
+            attempts: int = 3,
+            backoff: float = 0.1,
+            max_backoff: float = 5.0,
+            statuses: Collection[int] = (
+                HTTPStatus.TOO_MANY_REQUESTS,
+                HTTPStatus.BAD_GATEWAY,
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                HTTPStatus.GATEWAY_TIMEOUT,
+            ),
+            errors: ErrorTypes | None = None,
+    ) -> None:
+
+        if attempts < 1:
+            raise ValueError("RetryPolicy needs at least one attempt")
+
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.errors = errors
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """
+    Fails fast with CircuitOpenError after failure_threshold consecutive failures.
+    After reset_timeout lets one trial call through: its success closes circuit,
+    failure or any other error opens it again.
+    Failures are transient errors and 5xx responses. State is shared by all endpoints and clients it's set for
+
+    :param failure_threshold: consecutive failures that open circuit
+    :param reset_timeout: seconds circuit stays open before trial call
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return
+
+            if self.state is CircuitState.OPEN and monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                return
+
+        raise CircuitOpenError(f"Circuit is {self.state.value}, call rejected")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = monotonic()
+
+    def record_abort(self) -> None:
+        """
+        Call ended with error that isn't failure of service, like cancellation or error of hook.
+        Circuit is opened again if it was trial call, so next trial is let through after reset_timeout
+        """
+
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self.state = CircuitState.OPEN
+                self.opened_at = monotonic()
+
+    def record_response(self, response: Response) -> None:
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+class HedgePolicy:
+    """
+    Sends second identical request when first one isn't answered in time and returns whichever answers first.
+    Delay is fixed or percentile of recent latencies. Sync requests run on the policy thread pool while it has
+    free workers, otherwise on calling thread without hedging, so requests never wait in pool queue
+
+    :param delay: fixed delay in seconds before hedged request
+    :param percentile: latency percentile used as delay when it's not fixed
+    :param window: count of recent latencies to take percentile of
+    :param min_samples: latencies needed before hedging with percentile delay starts
+    :param max_workers: threads for sync requests
+    """
+
+    def __init__(
+            self,
+            delay: float | None = None,
+            percentile: float = 95.0,
+            window: int = 1000,
+            min_samples: int = 20,
+            max_workers: int = 20,
+    ) -> None:
+
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.hedged = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+        self._delay: float | None = None
+        self._records = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._busy_workers = 0
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float | None:
+        """
+        Seconds to wait before hedged request, None if there are not enough latencies yet
+        """
+
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        return self._delay
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self._records += 1
+            # sorting window on every request is too slow, so delay is refreshed every 10 records
+            if len(self.latencies) >= self.min_samples and (self._delay is None or self._records % 10 == 0):
+                latencies = sorted(self.latencies)
+                self._delay = latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))]
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def _timed(self, send: Callable[[], Response]) -> Response:
+        started_at = monotonic()
+        response = send()
+        self.record(monotonic() - started_at)
+        return response
+
+    def _reserve_worker(self) -> bool:
+        with self._lock:
+            if self._busy_workers >= self.max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _timed_reserved(self, send: Callable[[], Response]) -> Response:
+        try:
+            return self._timed(send)
+        finally:
+            with self._lock:
+                self._busy_workers -= 1
+
+    def send(self, send: Callable[[], Response]) -> Response:
+        delay = self.delay
+        # queued request would be hedged before it's sent, and busy pool would limit concurrency of callers
+        if delay is None or not self._reserve_worker():
+            return self._timed(send)
+
+        futures = {self.executor.submit(self._timed_reserved, send)}
+        done, _ = wait(futures, timeout=delay)
+        if not done and self._reserve_worker():
+            self.hedged += 1
+            futures.add(self.executor.submit(self._timed_reserved, send))
+
+        return _first_result(futures)
+
+    async def _timed_async(self, send: Callable[[], Awaitable[Response]]) -> Response:
+        started_at = monotonic()
+        response = await send()
+        self.record(monotonic() - started_at)
+        return response
+
+    async def send_async(self, send: Callable[[], Awaitable[Response]]) -> Response:
+        import asyncio
+
+        delay = self.delay
+        if delay is None:
+            return await self._timed_async(send)
+
+        tasks = {asyncio.ensure_future(self._timed_async(send))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedged += 1
+                tasks.add(asyncio.ensure_future(self._timed_async(send)))
+
+            while True:
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None or not pending:
+                        return task.result()
+                tasks = pending
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def _first_result(futures: set[Future[Response]]) -> Response:
+    """
+    Result of first successful future, or exception of the last one if all failed
+    """
+
+    while True:
+        done, pending = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None or not pending:
+                return future.result()
+        futures = pending
+
+
+def send_with_policies(
+        send: Callable[[], Response],
+        transient_errors: ErrorTypes,
+        retry: RetryPolicy | None,
+        circuit_breaker: CircuitBreaker | None,
+        hedge: HedgePolicy | None,
+        rate_limit: RateLimit | None = None,
+) -> Response:
+
+    attempts = retry.attempts if retry is not None else 1
+    for attempt in range(attempts):
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
+
+        retry_after = None
+        try:
+            with rate_limit or nullcontext():
+                response = hedge.send(send) if hedge is not None else send()
+        except transient_errors:
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
+            if retry is None or attempt == attempts - 1:
+                raise
+        except BaseException:
+            if circuit_breaker is not None:
+                circuit_breaker.record_abort()
+            raise
+        else:
+            if rate_limit is not None:
+                rate_limit.observe(response.status_code, response.headers)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(response)
+            if retry is None or attempt == attempts - 1 or response.status_code not in retry.statuses:
+                return response
+            retry_after = parse_retry_after(response.headers)
+
+        sleep(max(retry.delay(attempt), retry_after or 0))
+
+    raise AssertionError("Unreachable")
+
+
+async def send_with_policies_async(
+        send: Callable[[], Awaitable[Response]],
+        transient_errors: ErrorTypes,
+        retry: RetryPolicy | None,
+        circuit_breaker: CircuitBreaker | None,
+        hedge: HedgePolicy | None,
+        rate_limit: RateLimit | None = None,
+) -> Response:
+
+    import asyncio
+
+    attempts = retry.attempts if retry is not None else 1
+    for attempt in range(attempts):
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
+
+        retry_after = None
+        try:
+            async with rate_limit or nullcontext():
+                response = await (hedge.send_async(send) if hedge is not None else send())
+        except transient_errors:
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
+            if retry is None or attempt == attempts - 1:
+                raise
+        except BaseException:
+            if circuit_breaker is not None:
+                circuit_breaker.record_abort()
+            raise
+        else:
+            if rate_limit is not None:
+                rate_limit.observe(response.status_code, response.headers)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(response)
+            if retry is None or attempt == attempts - 1 or response.status_code not in retry.statuses:
+                return response
+            retry_after = parse_retry_after(response.headers)
+
+        await asyncio.sleep(max(retry.delay(attempt), retry_after or 0))
+
+    raise AssertionError("Unreachable")
+
@@ -1,24 +1,522 @@
-from typing import ParamSpec, TypeVar, Sequence, Callable, Type
-from http import HTTPMethod
-from inspect import signature
-from functools import partial
+from typing import ParamSpec, TypeVar, Sequence, Callable, Any, Generic, Hashable, Iterator, AsyncIterator
+from typing import AsyncGenerator, cast, get_origin
+from collections import abc
+from http import HTTPMethod, HTTPStatus
+from time import monotonic
+from inspect import signature, Parameter, iscoroutinefunction
+from functools import partial, wraps
+from contextlib import aclosing
 
-from .resources import BodyType
+from .resources import BodyType, ResourceModel
 from .parsers.args_parsers import get_args_dict
 from .parsers.response_parsers import ResponseParser
-from .parsers.type_alias_parsers import TypeAliasParser
-from .builders import build_body, build_path
+from .parsers.type_alias_parsers import TypeAliasParser, TypeConverter
+from .parsers.stream_parsers import iter_json_array, aiter_json_array
+from .parsers.lazy_parsers import compile_lazy_alias
+from .parsers.interning import StringInterner
+from .builders import compile_path, compile_body
+from .caches import ResponseCache, CacheEntry
+from .clients import Client, Response
+from .metrics import RequestObserver, Phase
+from .limits import RateLimit
+from .pagination import Pagination, Page, check_page, iter_pages, aiter_pages
+from .offload import ParseOffload
+from .policies import (
+    IDEMPOTENT_METHODS,
+    RetryPolicy,
+    CircuitBreaker,
+    HedgePolicy,
+    send_with_policies,
+    send_with_policies_async,
+)
 
 
 ArgsType = ParamSpec("ArgsType")
 ReturnType = TypeVar("ReturnType")
 
+ENDPOINT_PLAN_ATTRIBUTE = "__endpoint_plan__"
+
+
+class EndpointPlan(Generic[ReturnType]):
+    """
+    Everything about decorated endpoint that doesn't depend on call arguments.
+    Built once at decoration time, so call costs only arguments binding and I/O
+    """
+
+    def __init__(
+            self,
+            func: Callable[..., ReturnType],
+            endpoint_path: str,
+            request_type: HTTPMethod,
+            body: Sequence[str],
+            body_type: BodyType,
+            cache_ttl: float | None = None,
+            lazy: bool = False,
+            retry: RetryPolicy | None = None,
+            circuit_breaker: CircuitBreaker | None = None,
+            hedge: HedgePolicy | None = None,
+            rate_limit: RateLimit | None = None,
+            paginate: Pagination | None = None,
+            prefetch: int = 1,
+            offload: ParseOffload | None = None,
+            intern_strings: StringInterner | None = None,
+    ) -> None:
+
+        if cache_ttl is not None and request_type is not HTTPMethod.GET:
+            raise ValueError(f"Only {HTTPMethod.GET} responses can be cached, got {request_type}")
+
+        if (retry is not None or hedge is not None) and request_type not in IDEMPOTENT_METHODS:
+            raise ValueError(f"Only idempotent methods can be retried or hedged, got {request_type}")
+
+        func_signature = signature(func)
+
+        self.func = func
+        self.name = f"{request_type} {endpoint_path}"
+        self.request_type = request_type
+        self.cache_ttl = cache_ttl
+        self.lazy = lazy
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.hedge = hedge
+        self.rate_limit = rate_limit
+        self.has_policies = any(policy is not None for policy in (retry, circuit_breaker, hedge, rate_limit))
+        self.params_names = tuple(func_signature.parameters.keys())
+        self.defaults = tuple(
+            (name, param.default)
+            for name, param in func_signature.parameters.items()
+            if param.default is not Parameter.empty
+        )
+        self.expected_type: type[ReturnType] = func_signature.return_annotation
+
+        # Iterator[T] and AsyncIterator[T] endpoints decode top-level JSON array item by item as it arrives
+        self.stream_type = get_origin(self.expected_type) or self.expected_type
+        if self.stream_type not in (abc.Iterator, abc.AsyncIterator):
+            self.stream_type = None
+        self.stream_item_type = getattr(self.expected_type, "__args__", (None,))[0]
+
+        # paginated endpoints return Iterator[T] or AsyncIterator[T] over items of all pages
+        if paginate is not None and (self.stream_type is None or request_type is not HTTPMethod.GET):
+            raise ValueError("Only GET endpoints returning Iterator[T] or AsyncIterator[T] can be paginated")
+        self.paginate = paginate
+        self.prefetch = prefetch
+
+        # lazy endpoints convert items on access and streams item by item, so only whole responses are offloaded
+        if offload is not None and (not iscoroutinefunction(func) or self.stream_type is not None or lazy):
+            raise ValueError("Parsing can be offloaded only for async endpoints returning whole response")
+        self.offload = offload
+        self.intern_strings = intern_strings
+
+        self.path_template = compile_path(endpoint_path)
+        self.build_body = compile_body(body, body_type)
+
+        self.type_alias_parser = TypeAliasParser()
+        self.response_parser = ResponseParser(self.type_alias_parser)
+        self.convert_lazy: TypeConverter | None = None
+        self.convert_lazy_state = self.type_alias_parser.registry_state
+
+    def warmup(self) -> None:
+        """
+        Compiles response converters ahead of the first call
+        """
+
+        if self.stream_type is not None:
+            self.compile_stream_item()
+        elif self.lazy:
+            self.compile_lazy()
+        else:
+            self.type_alias_parser.compile(self.expected_type)
+
+    def bind(self, args: Sequence[Any], kwargs: dict[str, Any]) -> tuple[ResourceModel, dict[str, Any]]:
+        params = get_args_dict(self.params_names, args, kwargs)
+        for name, default in self.defaults:
+            if name not in params:
+                params[name] = default
+
+        model = params.pop(self.params_names[0])
+        return model, params
+
+    def build_request(
+            self,
+            args: Sequence[Any],
+            kwargs: dict[str, Any],
+    ) -> tuple[ResourceModel, str, dict[str, Any], dict[str, Any] | str]:
+
+        model, params = self.bind(args, kwargs)
+        path = self.path_template(params, exclude_params=True)
+        request_body = self.build_body(params)  # params left after path and body are query params
+        return model, path, params, request_body
+
+    def parse(self, response: Any) -> ReturnType:
+        if self.intern_strings is not None:
+            response = self.intern_strings(response)
+
+        if self.lazy:
+            return self.compile_lazy()(response)  # type: ignore[no-any-return]
+        return self.response_parser(response, self.expected_type)
+
+    def compile_lazy(self) -> TypeConverter:
+        """
+        Converter of lazy endpoint, compiled once and again only after parsers are registered
+        """
+
+        state = self.type_alias_parser.registry_state
+        if self.convert_lazy is None or self.convert_lazy_state != state:
+            self.convert_lazy = compile_lazy_alias(self.expected_type, self.type_alias_parser)
+            self.convert_lazy_state = state
+        return self.convert_lazy
+
+    def observe(self, args: Sequence[Any], kwargs: dict[str, Any]) -> RequestObserver | None:
+        """
+        Starts call observation if client has hooks attached
+        """
+
+        model = args[0] if args else kwargs[self.params_names[0]]
+        hooks = model.client.hooks
+        return RequestObserver(hooks, self.name) if hooks else None
+
+    def __call__(self, args: Sequence[Any], kwargs: dict[str, Any]) -> ReturnType:
+        observer = self.observe(args, kwargs)
+        if observer is None:
+            return self.call(args, kwargs)
+
+        try:
+            result = self.call(args, kwargs, observer)
+        except BaseException as e:
+            observer.fail(e)
+            raise
+        observer.finish()
+        return result
+
+    def call(
+            self,
+            args: Sequence[Any],
+            kwargs: dict[str, Any],
+            observer: RequestObserver | None = None,
+    ) -> ReturnType:
+
+        model, path, params, request_body = self.build_request(args, kwargs)
+        client = model.client
+
+        if self.stream_type is abc.Iterator:
+            return cast(ReturnType, self.stream(client, path, params, request_body))
+
+        if observer is not None:
+            observer.enter(Phase.NETWORK)
+
+        if client.single_flight is not None and self.request_type in client.single_flight.methods:
+            key = (self, client.single_flight.build_key(self.request_type, path, params, request_body))
+            return client.single_flight.do(key, partial(self.fetch, client, path, params, request_body, observer))
+
+        return self.fetch(client, path, params, request_body, observer)
+
+    async def call_async(self, args: Sequence[Any], kwargs: dict[str, Any]) -> ReturnType:
+        observer = self.observe(args, kwargs)
+        if observer is None:
+            return await self.call_async_observed(args, kwargs)
+
+        try:
+            result = await self.call_async_observed(args, kwargs, observer)
+        except BaseException as e:
+            observer.fail(e)
+            raise
+        observer.finish()
+        return result
+
+    async def call_async_observed(
+            self,
+            args: Sequence[Any],
+            kwargs: dict[str, Any],
+            observer: RequestObserver | None = None,
+    ) -> ReturnType:
+
+        model, path, params, request_body = self.build_request(args, kwargs)
+        client = model.client
+
+        if observer is not None:
+            observer.enter(Phase.NETWORK)
+
+        if client.single_flight is not None and self.request_type in client.single_flight.methods:
+            key = (self, client.single_flight.build_key(self.request_type, path, params, request_body))
+            return await client.single_flight.do_async(
+                key,
+                partial(self.fetch_async, client, path, params, request_body, observer),
+            )
+
+        return await self.fetch_async(client, path, params, request_body, observer)
+
+    def compile_stream_item(self) -> TypeConverter:
+        """
+        Converter of items of one stream, interned strings are shared by all items of the stream
+        """
+
+        convert_item: TypeConverter
+        if self.stream_item_type is None:
+            convert_item = _keep_item
+        else:
+            convert_item = self.type_alias_parser.compile(self.stream_item_type)
+
+        if self.intern_strings is None:
+            return convert_item
+
+        intern_item = self.intern_strings.start()
+        return lambda item: convert_item(intern_item(item))
+
+    def stream(
+            self,
+            client: Client,
+            path: str,
+            params: dict[str, Any],
+            request_body: dict[str, Any] | str,
+    ) -> Iterator[Any]:
+
+        if self.paginate is not None:
+            return self.iter_pages(client, path, params)
+
+        chunks = client.stream(self.request_type, path, params, request_body)
+        return map(self.compile_stream_item(), iter_json_array(chunks))
+
+    async def stream_async(self, args: Sequence[Any], kwargs: dict[str, Any]) -> AsyncIterator[Any]:
+        model, path, params, request_body = self.build_request(args, kwargs)
+
+        if self.paginate is not None:
+            async with aclosing(self.aiter_pages(model.client, path, params)) as items:
+                async for item in items:
+                    yield item
+            return
+
+        convert_item = self.compile_stream_item()
+        chunks = model.client.stream(self.request_type, path, params, request_body)
+        async for item in aiter_json_array(chunks):
+            yield convert_item(item)
+
+    def iter_pages(self, client: Client, path: str, params: dict[str, Any]) -> Iterator[Any]:
+        assert self.paginate is not None
+        paginate = self.paginate
+        convert_item = self.compile_stream_item()
+
+        def fetch_page(page_path: str, page_params: dict[str, Any]) -> Page:
+            response = self.send(client, page_path, page_params, None)
+            check_page(response, page_path)
+            page = response.json()
+            items = list(map(convert_item, paginate.get_items(page)))
+            return items, paginate.next_request(page, response, page_path, page_params, client.api_url)
+
+        return iter_pages(fetch_page, (path, paginate.first_params(params)), self.prefetch)
+
+    def aiter_pages(self, client: Client, path: str, params: dict[str, Any]) -> AsyncGenerator[Any, None]:
+        assert self.paginate is not None
+        paginate = self.paginate
+        convert_item = self.compile_stream_item()
+
+        async def fetch_page(page_path: str, page_params: dict[str, Any]) -> Page:
+            response = await self.send_async(client, page_path, page_params, None)
+            check_page(response, page_path)
+            page = response.json()
+            items = list(map(convert_item, paginate.get_items(page)))
+            return items, paginate.next_request(page, response, page_path, page_params, client.api_url)
+
+        return aiter_pages(fetch_page, (path, paginate.first_params(params)), self.prefetch)
+
+    def fetch(
+            self,
+            client: Client,
+            path: str,
+            params: dict[str, Any],
+            request_body: dict[str, Any] | str,
+            observer: RequestObserver | None = None,
+    ) -> ReturnType:
+
+        if self.cache_ttl is not None and client.cache is not None:
+            key = (self, client.cache.build_key(self.request_type, path, params))
+            entry = client.cache.get(key)
+            if entry is not None and entry.is_fresh:
+                client.cache.hits += 1
+                return entry.value  # type: ignore[no-any-return]
+
+            headers = entry.validators if entry is not None else None
+            cached_response = self.send(client, path, params, None, headers)
+            return self.parse_cached(client.cache, key, entry, cached_response, observer)
+
+        if self.has_policies:
+            return self.parse_response(self.send(client, path, params, request_body), observer)
+
+        response = client.request(path, self.request_type, params, request_body, observer)
+        if observer is not None:
+            observer.enter(Phase.PARSE)
+        return self.parse(response)
+
+    async def fetch_async(
+            self,
+            client: Client,
+            path: str,
+            params: dict[str, Any],
+            request_body: dict[str, Any] | str,
+            observer: RequestObserver | None = None,
+    ) -> ReturnType:
+
+        if self.cache_ttl is not None and client.cache is not None:
+            key = (self, client.cache.build_key(self.request_type, path, params))
+            entry = client.cache.get(key)
+            if entry is not None and entry.is_fresh:
+                client.cache.hits += 1
+                return entry.value  # type: ignore[no-any-return]
+
+            headers = entry.validators if entry is not None else None
+            cached_response = await self.send_async(client, path, params, None, headers)
+            if self.offload is not None and self.offload.accepts(cached_response):
+                value = await self.parse_response_async(cached_response, observer)
+                return self.cache_parsed(client.cache, key, cached_response, value)
+            return self.parse_cached(client.cache, key, entry, cached_response, observer)
+
+        if self.has_policies or self.offload is not None:
+            response = await self.send_async(client, path, params, request_body)
+            return await self.parse_response_async(response, observer)
+
+        response = await client.request(path, self.request_type, params, request_body, observer)
+        if observer is not None:
+            observer.enter(Phase.PARSE)
+        return self.parse(response)
+
+    def send(
+            self,
+            client: Client,
+            path: str,
+            params: dict[str, Any],
+            request_body: dict[str, Any] | str | None,
+            headers: dict[str, str] | None = None,
+    ) -> Response:
+
+        body = None if self.request_type is HTTPMethod.GET else request_body
+        send = partial(client.send, self.request_type, path, params, body, headers)
+        if not self.has_policies:
+            return send()  # type: ignore[no-any-return]
+
+        retry_errors = self.retry.errors if self.retry is not None else None
+        return send_with_policies(
+            send,
+            retry_errors or client.transient_errors,
+            self.retry,
+            self.circuit_breaker,
+            self.hedge,
+            self.rate_limit,
+        )
+
+    async def send_async(
+            self,
+            client: Client,
+            path: str,
+            params: dict[str, Any],
+            request_body: dict[str, Any] | str | None,
+            headers: dict[str, str] | None = None,
+    ) -> Response:
+
+        body = None if self.request_type is HTTPMethod.GET else request_body
+        send = partial(client.send, self.request_type, path, params, body, headers)
+        if not self.has_policies:
+            return await send()  # type: ignore[no-any-return]
+
+        retry_errors = self.retry.errors if self.retry is not None else None
+        return await send_with_policies_async(
+            send,
+            retry_errors or client.transient_errors,
+            self.retry,
+            self.circuit_breaker,
+            self.hedge,
+            self.rate_limit,
+        )
+
+    def parse_response(self, response: Response, observer: RequestObserver | None = None) -> ReturnType:
+        if observer is None:
+            return self.parse(response.json())
+
+        observer.response(response.status_code, len(response.content))
+        observer.enter(Phase.DECODE)
+        decoded = response.json()
+        observer.enter(Phase.PARSE)
+        return self.parse(decoded)
+
+    async def parse_response_async(self, response: Response, observer: RequestObserver | None = None) -> ReturnType:
+        """
+        Parses large responses in offload executor and others on the loop
+        """
+
+        if self.offload is None or not self.offload.accepts(response):
+            return self.parse_response(response, observer)
+
+        if observer is not None:
+            observer.response(response.status_code, len(response.content))
+            observer.enter(Phase.PARSE)  # decoding is timed together with conversion in executor
+        value = await self.offload.parse(response, self.expected_type, self.parse_response, self.intern_strings)
+        return cast(ReturnType, value)
+
+    def parse_cached(
+            self,
+            cache: ResponseCache,
+            key: Hashable,
+            entry: CacheEntry | None,
+            response: Response,
+            observer: RequestObserver | None = None,
+    ) -> ReturnType:
+        """
+        Revalidated entry (304 Not Modified) is a hit, any other successful response replaces cached one
+        """
+
+        assert self.cache_ttl is not None
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+            cache.hits += 1
+            cache.refresh(entry, self.cache_ttl)
+            return entry.value  # type: ignore[no-any-return]
+
+        return self.cache_parsed(cache, key, response, self.parse_response(response, observer))
+
+    def cache_parsed(self, cache: ResponseCache, key: Hashable, response: Response, value: ReturnType) -> ReturnType:
+        """
+        Counts miss and caches value of successful response
+        """
+
+        assert self.cache_ttl is not None
+
+        cache.misses += 1
+        if HTTPStatus.OK <= response.status_code < HTTPStatus.MULTIPLE_CHOICES:
+            cache.set(key, CacheEntry(
+                value,
+                size=len(response.content),
+                expires_at=monotonic() + self.cache_ttl,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            ))
+        return value
+
+
+def get_endpoint_plan(method: Any) -> EndpointPlan[Any] | None:
+    """
+    Plan of method decorated as endpoint, None for other attributes
+    """
+
+    plan = getattr(method, ENDPOINT_PLAN_ATTRIBUTE, None)
+    return plan if isinstance(plan, EndpointPlan) else None
+
+
+def _keep_item(item: Any) -> Any:
+    return item
+
 
 def create_request_decorator(
         endpoint_path: str,
         request_type: HTTPMethod,
         body: Sequence[str] = tuple(),
         body_type: BodyType = BodyType.EMBEDDED,
+        cache_ttl: float | None = None,
+        lazy: bool = False,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge: HedgePolicy | None = None,
+        rate_limit: RateLimit | None = None,
+        paginate: Pagination | None = None,
+        prefetch: int = 1,
+        offload: ParseOffload | None = None,
+        intern_strings: StringInterner | None = None,
 ) -> Callable[
     [
         Callable[ArgsType, ReturnType]
@@ -27,22 +525,48 @@ def create_request_decorator(
 ]:
 
     def decorator(func: Callable[ArgsType, ReturnType]) -> Callable[ArgsType, ReturnType]:
-        def request(*args: ArgsType.args, **kwargs: ArgsType.kwargs) -> ReturnType:
+        plan = EndpointPlan(
+            func,
+            endpoint_path,
+            request_type,
+            body,
+            body_type,
+            cache_ttl,
+            lazy,
+            retry,
+            circuit_breaker,
+            hedge,
+            rate_limit,
+            paginate,
+            prefetch,
+            offload,
+            intern_strings,
+        )
+
+        request: Callable[ArgsType, Any]
+        if plan.stream_type is abc.AsyncIterator:
+            @wraps(func)
+            def async_stream_request(*args: ArgsType.args, **kwargs: ArgsType.kwargs) -> Any:
+                return plan.stream_async(args, kwargs)
+
+            request = async_stream_request
 
-            params = get_args_dict(signature(func).parameters.keys(), args, kwargs)
-            path = build_path(endpoint_path, params, exclude_params=True)
-            model = params.pop("self")
-            request_body = build_body(body, params, body_type, exclude_params=True)
+        elif iscoroutinefunction(func):
+            @wraps(func)
+            async def async_request(*args: ArgsType.args, **kwargs: ArgsType.kwargs) -> Any:
+                return await plan.call_async(args, kwargs)
 
-            response = model.client.request(path, request_type, params, request_body)
-            expected_type: Type[ReturnType] = signature(func).return_annotation
+            request = async_request
 
-            type_aliases_parser = TypeAliasParser()
-            response_parser = ResponseParser(type_aliases_parser)
+        else:
+            @wraps(func)
+            def sync_request(*args: ArgsType.args, **kwargs: ArgsType.kwargs) -> ReturnType:
+                return plan(args, kwargs)
 
-            return response_parser(response, expected_type)
+            request = sync_request
 
-        return request
+        setattr(request, ENDPOINT_PLAN_ATTRIBUTE, plan)  # lets ResourceModel.warmup find endpoints
+        return cast(Callable[ArgsType, ReturnType], request)
 
     return decorator
 
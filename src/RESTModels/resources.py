@@ -1,12 +1,46 @@
 from enum import Enum
+from typing import Any, TYPE_CHECKING
 
 from .clients import Client
 
+if TYPE_CHECKING:
+    from .requests import EndpointPlan
+
 
 class ResourceModel:
     def __init__(self, client: Client) -> None:
         self.client = client
 
+    @classmethod
+    def endpoints(cls) -> list["EndpointPlan[Any]"]:
+        """
+        Plans of all methods decorated as endpoints, including inherited ones
+        """
+
+        from .requests import get_endpoint_plan
+
+        plans: dict[str, EndpointPlan[Any]] = {}
+        for klass in reversed(cls.__mro__):
+            for name, member in vars(klass).items():
+                plan = get_endpoint_plan(member)
+                if plan is not None:
+                    plans[name] = plan
+                else:
+                    plans.pop(name, None)  # overridden by plain method
+        return list(plans.values())
+
+    def warmup(self, connections: int = 1) -> Any:
+        """
+        Compiles response converters of all endpoints and opens client connections,
+        so first calls run at full speed. Returns awaitable for AsyncClient
+
+        :param connections: connections to open
+        """
+
+        for plan in self.endpoints():
+            plan.warmup()
+        return self.client.warmup(connections)
+
 
 class BodyType(Enum):
     EMBEDDED = "EMBEDDED"
@@ -0,0 +1,104 @@
+import threading
+from concurrent.futures import Future
+from http import HTTPMethod
+from typing import Any, Awaitable, Callable, Collection, Hashable, Mapping, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+T = TypeVar("T")
+LEADER_CANCELLED: Any = object()
+
+
+class SingleFlight:
+    """
+    Makes concurrent identical requests share one call and its result.
+    Works for threads and asyncio tasks, tasks are coalesced within their event loop.
+    When leading task is cancelled, one of tasks waiting for it makes the call instead
+
+    :param methods: methods that can be coalesced. Only GET by default, because other methods aren't safe
+    """
+
+    def __init__(self, methods: Collection[HTTPMethod] = (HTTPMethod.GET,)) -> None:
+        self.methods = frozenset(methods)
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, Future[Any]] = {}
+        self._async_flights: dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(
+            method: HTTPMethod,
+            endpoint_path: str,
+            params: Mapping[str, Any],
+            body: Any,
+    ) -> Hashable:
+
+        return method, endpoint_path, tuple(sorted((name, repr(value)) for name, value in params.items())), repr(body)
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                leader_flight: Future[Any] = Future()
+                self._flights[key] = leader_flight
+
+        if flight is not None:
+            return flight.result()  # type: ignore[no-any-return]
+
+        try:
+            result = call()
+        except BaseException as error:
+            leader_flight.set_exception(error)
+            raise
+        else:
+            leader_flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    async def do_async(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+
+        while True:
+            with self._lock:
+                self.calls += 1
+                flight = self._async_flights.get(key)
+                if flight is None:
+                    self._async_flights[key] = leader_flight = loop.create_future()
+                    break
+                self.coalesced += 1
+
+            result = await asyncio.shield(flight)
+            if result is not LEADER_CANCELLED:
+                return result  # type: ignore[no-any-return]
+
+            # followers weren't cancelled with leader, they join new flight and first of them leads it
+            with self._lock:
+                self.calls -= 1
+                self.coalesced -= 1
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            leader_flight.set_result(LEADER_CANCELLED)
+            raise
+        except BaseException as error:
+            leader_flight.set_exception(error)
+            leader_flight.exception()  # mark retrieved, when nobody waits for the flight
+            raise
+        else:
+            leader_flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_flights[key]
@@ -0,0 +1,92 @@
+import json
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit, parse_qsl
+
+import pytest
+
+
+Route = Callable[["StubRequest"], tuple[int, dict[str, str], bytes]]
+
+
+class StubRequest:
+    def __init__(self, method: str, path: str, query: dict[str, str], headers: Any, body: bytes, peer: Any) -> None:
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.peer = peer
+
+
+def echo_route(request: StubRequest) -> tuple[int, dict[str, str], bytes]:
+    body = json.dumps({
+        "method": request.method,
+        "path": request.path,
+        "query": request.query,
+        "body": json.loads(request.body) if request.body else None,
+        "peer": list(request.peer),
+    })
+    return 200, {"Content-Type": "application/json"}, body.encode()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.routes: dict[str, Route] = {}
+        self.requests: list[StubRequest] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        if not isinstance(sys.exc_info()[1], ConnectionError):  # client gone, like cancelled hedged request
+            super().handle_error(request, client_address)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def _handle(self) -> None:
+        url = urlsplit(self.path)
+        content_length = int(self.headers.get("Content-Length", 0))
+        request = StubRequest(
+            self.command,
+            url.path,
+            dict(parse_qsl(url.query)),
+            self.headers,
+            self.rfile.read(content_length),
+            self.client_address,
+        )
+        self.server.requests.append(request)
+
+        status, headers, body = self.server.routes.get(url.path, echo_route)(request)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from RESTModels import ResourceModel, SyncClient, AsyncClient, batched, get
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def items_route(request):
+    ids = [int(item_id) for item_id in request.query["ids"].split(",")]
+    items = [{"id": item_id, "name": f"item{item_id}"} for item_id in ids if item_id > 0]
+    return 200, JSON_HEADERS, json.dumps(items).encode()
+
+
+class Model(ResourceModel):
+    @get("/items")
+    def get_items(self, ids: str) -> list[dict]:
+        ...
+
+    def get_items_by_ids(self, ids: list[int]) -> list[dict]:
+        return self.get_items(",".join(map(str, ids)))
+
+    @batched(get_items_by_ids, key="id", window=0.05)
+    def get_item(self, item_id: int) -> dict:
+        ...
+
+    @batched(get_items_by_ids, key="uuid", window=0.05)
+    def get_item_by_uuid(self, item_id: int) -> dict:
+        ...
+
+    @batched(get_items_by_ids, window=0.05, max_batch_size=3)
+    def get_item_by_position(self, item_id: int) -> dict:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/items")
+    async def get_items(self, ids: str) -> list[dict]:
+        ...
+
+    async def get_items_by_ids(self, ids: list[int]) -> list[dict]:
+        return await self.get_items(",".join(map(str, ids)))
+
+    @batched(get_items_by_ids, key=lambda item: item["id"], window=0)
+    async def get_item(self, item_id: int) -> dict:
+        ...
+
+    @batched(get_items_by_ids, key="id", window=0.05)
+    async def get_item_later(self, item_id: int) -> dict:
+        ...
+
+
+@pytest.fixture
+def items_server(stub_server):
+    stub_server.routes["/items"] = items_route
+    return stub_server
+
+
+def test_threads_batched(items_server):
+    with SyncClient(items_server.url) as client:
+        model = Model(client)
+        with ThreadPoolExecutor(10) as executor:
+            items = list(executor.map(model.get_item, [1, 2, 3, 2, 5]))
+
+    assert [item["name"] for item in items] == ["item1", "item2", "item3", "item2", "item5"]
+    assert [request.query["ids"] for request in items_server.requests] == ["1,2,3,5"]
+
+
+def test_max_batch_size(items_server):
+    with SyncClient(items_server.url) as client:
+        model = Model(client)
+        with ThreadPoolExecutor(10) as executor:
+            items = list(executor.map(model.get_item_by_position, range(1, 7)))
+
+    assert [item["id"] for item in items] == [1, 2, 3, 4, 5, 6]
+    assert sorted(len(request.query["ids"].split(",")) for request in items_server.requests) == [3, 3]
+
+
+def test_missing_key(items_server):
+    with SyncClient(items_server.url) as client:
+        with pytest.raises(KeyError):
+            Model(client).get_item(item_id=0)
+
+
+def test_positional_results_count(items_server):
+    with SyncClient(items_server.url) as client:
+        with pytest.raises(ValueError):
+            Model(client).get_item_by_position(0)
+
+
+def test_unmatched_key_fails_all_callers(items_server):
+    with SyncClient(items_server.url) as client:
+        model = Model(client)
+        with ThreadPoolExecutor(3) as executor:
+            futures = [executor.submit(model.get_item_by_uuid, i) for i in (1, 2, 3)]
+            errors = [future.exception(timeout=5) for future in futures]
+
+    assert all(isinstance(error, KeyError) for error in errors)
+    assert len(items_server.requests) == 1
+
+
+def test_single_key_argument():
+    with pytest.raises(TypeError):
+        class BadModel(ResourceModel):
+            def get_items(self, ids: list[int]) -> list[dict]:
+                ...
+
+            @batched(get_items)
+            def get_item(self, item_id: int, expand: bool) -> dict:
+                ...
+
+
+def test_async_batched(items_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(items_server.url) as client:
+            model = AsyncModel(client)
+            first = await asyncio.gather(*(model.get_item(i) for i in (1, 2, 3)))
+            second = await model.get_item(4)
+            return first, second
+
+    first, second = asyncio.run(main())
+
+    assert [item["id"] for item in first] == [1, 2, 3]
+    assert second["id"] == 4
+    assert [request.query["ids"] for request in items_server.requests] == ["1,2,3", "4"]
+
+
+def test_async_leader_cancelled(items_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(items_server.url) as client:
+            model = AsyncModel(client)
+            leader = asyncio.create_task(model.get_item_later(1))
+            follower = asyncio.create_task(model.get_item_later(2))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            item = await asyncio.wait_for(follower, 1)
+            next_item = await asyncio.wait_for(model.get_item_later(3), 1)
+            return leader, item, next_item
+
+    leader, item, next_item = asyncio.run(main())
+
+    assert leader.cancelled()
+    assert item["id"] == 2
+    assert next_item["id"] == 3
+    assert [request.query["ids"] for request in items_server.requests] == ["1,2", "3"]
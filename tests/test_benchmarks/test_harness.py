@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+
+from benchmarks.harness import Benchmark, BenchmarkResult, percentile, run_benchmark, compare, format_time
+
+
+def test_percentile():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 90) == pytest.approx(4.6)
+    assert percentile(values, 100) == 5.0
+    assert percentile([7.0], 99) == 7.0
+
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_result():
+    result = BenchmarkResult("group.name", [0.3, 0.1, 0.2, 0.2])
+
+    assert result.throughput == pytest.approx(5.0)
+    assert result.percentile(50) == pytest.approx(0.2)
+    assert result.to_dict()["p50"] == pytest.approx(0.2)
+
+
+def test_run_benchmark():
+    calls = []
+    teardown = []
+
+    def setup() -> Iterator[object]:
+        yield lambda: calls.append(1)
+        teardown.append(1)
+
+    result = run_benchmark(Benchmark("group", "name", contextmanager(setup), number=5), rounds=4, warmup_rounds=1)
+
+    assert result.name == "group.name"
+    assert len(result.timings) == 4
+    assert len(calls) == 25
+    assert teardown == [1]
+
+
+def test_compare():
+    result = BenchmarkResult("group.name", [0.12])
+    baseline = {"group.name": {"throughput": 10.0, "p50": 0.1}}
+
+    change, is_regression = compare(result, baseline, threshold=0.1)
+    assert change == pytest.approx(0.2)
+    assert is_regression
+
+    assert compare(result, baseline, threshold=0.5) == (pytest.approx(0.2), False)
+    assert compare(result, {}, threshold=0.1) == (None, False)
+
+
+def test_format_time():
+    assert format_time(1.5) == "1.50s"
+    assert format_time(0.0025) == "2.50ms"
+    assert format_time(0.0000031) == "3.10us"
+    assert format_time(0.00000005) == "50ns"
@@ -0,0 +1,52 @@
+import pytest
+
+from RESTModels.builders import build_path, build_body, compile_path, compile_body
+from RESTModels.resources import BodyType
+
+
+def test_build_path():
+    params = {"todo_id": 5, "count": 2}
+
+    assert build_path("/todos/{todo_id}", params) == "/todos/5"
+    assert params == {"todo_id": 5, "count": 2}
+
+    assert build_path("/todos/{todo_id}", params, exclude_params=True) == "/todos/5"
+    assert params == {"count": 2}
+
+
+def test_build_path_with_repeated_param():
+    params = {"user": "me"}
+
+    assert build_path("/{user}/todos/{user}/", params, exclude_params=True) == "/me/todos/me/"
+    assert params == {}
+
+
+def test_compile_path():
+    path_template = compile_path("/users/{user_id}/todos/{todo_id}")
+
+    assert path_template.params_names == ("user_id", "todo_id")
+    assert path_template({"user_id": 1, "todo_id": 2}) == "/users/1/todos/2"
+    assert compile_path("/users/{user_id}/todos/{todo_id}") is path_template
+
+
+def test_compile_body():
+    params = {"title": "text", "done": False, "count": 2}
+
+    build_embedded_body = compile_body(("title", "done"), BodyType.EMBEDDED)
+    assert build_embedded_body(params) == {"title": "text", "done": False}
+    assert params == {"count": 2}
+
+    build_flat_body = compile_body(("count",), BodyType.FLAT)
+    assert build_flat_body(params) == "2"
+    assert params == {}
+
+    with pytest.raises(ValueError):
+        compile_body(("title", "done"), BodyType.FLAT)
+
+
+def test_build_body():
+    params = {"title": "text", "count": 2}
+
+    assert build_body(("title",), params, BodyType.EMBEDDED) == {"title": "text"}
+    assert build_body(("count",), params, BodyType.FLAT, exclude_params=True) == "2"
+    assert params == {"title": "text"}
@@ -0,0 +1,126 @@
+import asyncio
+from http import HTTPMethod
+
+import pytest
+
+from RESTModels import AsyncClient, ResourceModel, ResponseCache, SyncClient, get, post
+from RESTModels.caches import CacheEntry
+
+
+def etag_route(request):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return 304, {"ETag": '"v1"'}, b""
+    return 200, {"ETag": '"v1"', "Content-Type": "application/json"}, b'["1", "2"]'
+
+
+class Model(ResourceModel):
+    @get("/todos", cache_ttl=60)
+    def get_todos(self, page: int = 0) -> list[int]:
+        ...
+
+    @get("/versioned", cache_ttl=0)
+    def get_versioned(self) -> list[int]:
+        ...
+
+    @get("/todos")
+    def get_fresh_todos(self) -> list[int]:
+        ...
+
+
+class RawModel(ResourceModel):
+    @get("/todos", cache_ttl=60)
+    def get_raw_todos(self) -> list[str]:
+        ...
+
+    @get("/todos", cache_ttl=60)
+    def get_todos(self) -> list[int]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/versioned", cache_ttl=0)
+    async def get_versioned(self) -> list[int]:
+        ...
+
+
+def test_cached_endpoint(stub_server):
+    cache = ResponseCache()
+    with SyncClient(stub_server.url, cache=cache) as client:
+        model = Model(client)
+        stub_server.routes["/todos"] = lambda request: (200, {}, b"[1, 2]")
+
+        assert model.get_todos() == [1, 2]
+        assert model.get_todos() == [1, 2]
+        assert model.get_todos(page=1) == [1, 2]
+        model.get_fresh_todos()
+
+    assert len(stub_server.requests) == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_key_depends_on_endpoint(stub_server):
+    stub_server.routes["/todos"] = lambda request: (200, {}, b'["1", "2"]')
+    with SyncClient(stub_server.url, cache=ResponseCache()) as client:
+        model = RawModel(client)
+
+        assert model.get_raw_todos() == ["1", "2"]
+        assert model.get_todos() == [1, 2]
+        assert model.get_raw_todos() == ["1", "2"]
+
+    assert len(stub_server.requests) == 2
+
+
+def test_cache_revalidation(stub_server):
+    cache = ResponseCache()
+    stub_server.routes["/versioned"] = etag_route
+    with SyncClient(stub_server.url, cache=cache) as client:
+        model = Model(client)
+        first_result = model.get_versioned()
+        assert model.get_versioned() is first_result
+
+    assert [request.headers.get("If-None-Match") for request in stub_server.requests] == [None, '"v1"']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_async_cache_revalidation(stub_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(stub_server.url, cache=cache) as client:
+            model = AsyncModel(client)
+            return [await model.get_versioned() for _ in range(3)]
+
+    cache = ResponseCache()
+    stub_server.routes["/versioned"] = etag_route
+
+    assert asyncio.run(main()) == [[1, 2]] * 3
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_eviction():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+
+    cache.set("first", CacheEntry(1, size=4, expires_at=0))
+    cache.set("second", CacheEntry(2, size=4, expires_at=0))
+    cache.get("first")
+    cache.set("third", CacheEntry(3, size=1, expires_at=0))
+
+    assert cache.get("second") is None
+    assert cache.get("first").value == 1
+
+    cache.set("fourth", CacheEntry(4, size=8, expires_at=0))
+
+    assert len(cache) == 1
+    assert cache.size == 8
+
+
+def test_cache_key_depends_on_params():
+    assert ResponseCache.build_key(HTTPMethod.GET, "/", {"a": 1, "b": 2}) == \
+           ResponseCache.build_key(HTTPMethod.GET, "/", {"b": 2, "a": 1})
+    assert ResponseCache.build_key(HTTPMethod.GET, "/", {"a": 1}) != \
+           ResponseCache.build_key(HTTPMethod.GET, "/", {"a": "1"})
+
+
+def test_only_get_can_be_cached():
+    with pytest.raises(ValueError):
+        post("/todos", cache_ttl=10)(lambda self: None)
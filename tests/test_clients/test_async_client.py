@@ -0,0 +1,65 @@
+import asyncio
+import gc
+import warnings
+from http import HTTPMethod
+
+import pytest
+
+from RESTModels import AsyncClient, ResourceModel, get, post
+
+pytest.importorskip("aiohttp")
+
+
+class Model(ResourceModel):
+    @get("/todos/{todo_id}")
+    async def get_todo(self, todo_id: int, done: bool = False) -> dict:
+        ...
+
+    @post("/todos", body=("title",))
+    async def make_todo(self, title: str) -> dict:
+        ...
+
+
+def test_async_client_request(stub_server):
+    async def main():
+        async with AsyncClient(stub_server.url) as client:
+            return await client.request("/todos", HTTPMethod.PUT, {"count": 1, "skip": None}, {"title": "text"})
+
+    response = asyncio.run(main())
+
+    assert response["method"] == "PUT"
+    assert response["query"] == {"count": "1"}
+    assert response["body"] == {"title": "text"}
+
+
+def test_async_endpoints(stub_server):
+    async def main():
+        async with AsyncClient(stub_server.url, limit=5) as client:
+            model = Model(client)
+            todos = await asyncio.gather(*(model.get_todo(i, done=True) for i in range(50)))
+            created_todo = await model.make_todo("text")
+        return todos, created_todo
+
+    todos, created_todo = asyncio.run(main())
+
+    assert [todo["path"] for todo in todos] == [f"/todos/{i}" for i in range(50)]
+    assert {todo["query"]["done"] for todo in todos} == {"True"}
+    assert len({tuple(todo["peer"]) for todo in todos}) <= 5
+    assert created_todo["body"] == {"title": "text"}
+
+
+def test_client_reused_in_next_event_loop(stub_server):
+    client = AsyncClient(stub_server.url)
+    model = Model(client)
+
+    async def main(todo_id):
+        return await model.get_todo(todo_id)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        first, second = asyncio.run(main(1)), asyncio.run(main(2))
+        asyncio.run(client.close())
+        gc.collect()
+
+    assert (first["path"], second["path"]) == ("/todos/1", "/todos/2")
+    assert not [warning for warning in caught if "Unclosed" in str(warning.message)]
@@ -0,0 +1,51 @@
+import asyncio
+import json
+from datetime import date
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from RESTModels import AsyncClient, ResourceModel, SyncClient, get
+
+
+ROWS = [["2023-10-22", i] for i in range(1000)]
+
+
+def rows_route(request):
+    return 200, {"Content-Type": "application/json"}, json.dumps(ROWS).encode()
+
+
+class Model(ResourceModel):
+    @get("/rows")
+    def export_rows(self) -> Iterator[tuple[date, str]]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/rows")
+    def export_rows(self) -> AsyncIterator[tuple[date, str]]:
+        ...
+
+
+EXPECTED_ROWS = [(date(2023, 10, 22), str(i)) for i in range(1000)]
+
+
+def test_iterator_endpoint(stub_server):
+    stub_server.routes["/rows"] = rows_route
+
+    with SyncClient(stub_server.url) as client:
+        rows = Model(client).export_rows()
+        assert not stub_server.requests
+        assert list(rows) == EXPECTED_ROWS
+
+
+def test_async_iterator_endpoint(stub_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(stub_server.url) as client:
+            return [row async for row in AsyncModel(client).export_rows()]
+
+    stub_server.routes["/rows"] = rows_route
+
+    assert asyncio.run(main()) == EXPECTED_ROWS
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPMethod
+
+from RESTModels import SyncClient
+
+
+def test_sync_client_request(stub_server):
+    with SyncClient(stub_server.url) as client:
+        response = client.request("/todos", HTTPMethod.POST, {"count": "1"}, {"title": "text"})
+
+    assert response["method"] == "POST"
+    assert response["path"] == "/todos"
+    assert response["query"] == {"count": "1"}
+    assert response["body"] == {"title": "text"}
+
+
+def test_sync_client_reuses_connections(stub_server):
+    with SyncClient(stub_server.url) as client:
+        peers = {tuple(client.get("/todos", {})["peer"]) for _ in range(5)}
+
+    assert len(peers) == 1
+
+
+def test_sync_client_evicts_idle_connections(stub_server):
+    with SyncClient(stub_server.url, idle_timeout=0) as client:
+        peers = {tuple(client.get("/todos", {})["peer"]) for _ in range(3)}
+
+    assert len(peers) == 3
+
+
+def test_sync_client_shared_between_threads(stub_server):
+    with SyncClient(stub_server.url, pool_maxsize=4) as client:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(lambda i: client.get(f"/todos/{i}", {}), range(20)))
+
+    assert [response["path"] for response in responses] == [f"/todos/{i}" for i in range(20)]
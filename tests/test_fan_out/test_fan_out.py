@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+
+from RESTModels import Call, fan_out, fan_out_async
+
+
+def divide(first: int, second: int = 1) -> float:
+    time.sleep(0.01)
+    return first / second
+
+
+def test_fan_out_keeps_order_and_collects_exceptions():
+    results = fan_out(divide, [4, (6, 2), Call(1, second=0), Call(9, second=3)])
+
+    assert results[:2] == [4, 3]
+    assert isinstance(results[2], ZeroDivisionError)
+    assert results[3] == 3
+
+
+def test_fan_out_limit():
+    lock = threading.Lock()
+    in_flight = max_in_flight = 0
+
+    def track(value: int) -> int:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return value
+
+    assert fan_out(track, range(20), limit=3) == list(range(20))
+    assert max_in_flight <= 3
+
+
+def test_fan_out_async():
+    in_flight = max_in_flight = 0
+
+    async def track(value: int, second: int = 1) -> float:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return value / second
+
+    results = asyncio.run(fan_out_async(track, [*range(10), Call(1, second=0)], limit=4))
+
+    assert results[:10] == list(range(10))
+    assert isinstance(results[10], ZeroDivisionError)
+    assert max_in_flight == 4
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+
+IMPORT_TIME_BUDGET = 0.1  # seconds, measured with bytecode cached
+LAZY_MODULES = ("requests", "urllib3", "aiohttp", "asyncio", "numpy", "orjson", "email.utils")
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    return subprocess.run([sys.executable, *options, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def package_import_time() -> float:
+    """
+    Cumulative import time of package in fresh interpreter from -X importtime report
+    """
+
+    report = run_python("import RESTModels", "-X", "importtime").stderr
+    for line in report.splitlines():
+        if line.rstrip().endswith("| RESTModels"):
+            return int(line.split("|")[1]) / 1_000_000
+    raise AssertionError(f"Package is missing in import time report:\n{report}")
+
+
+def test_backends_are_not_imported():
+    code = f"import sys, RESTModels; print(*[name for name in {LAZY_MODULES!r} if name in sys.modules])"
+    assert run_python(code).stdout.split() == []
+
+
+def test_import_time_budget():
+    package_import_time()  # compiles bytecode
+    assert min(package_import_time() for _ in range(3)) < IMPORT_TIME_BUDGET
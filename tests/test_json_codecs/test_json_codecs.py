@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from RESTModels import SyncClient
+from RESTModels.json_codecs import OrjsonCodec, StdlibJSONCodec, get_default_codec
+
+
+def get_codecs():
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", get_codecs(), ids=lambda codec: type(codec).__name__)
+def test_codec(codec):
+    value = {"text": "юникод", "items": [1, 2.5, None, True], "big": 2 ** 70}
+    data = json.dumps(value).encode()
+
+    assert codec.decode(data) == value
+    assert codec.decode(memoryview(data)) == value
+    assert codec.decode(bytearray(data)) == value
+
+    encoded = codec.encode(value)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == value
+
+
+def test_default_codec():
+    expected_codec_type = OrjsonCodec if any(isinstance(codec, OrjsonCodec) for codec in get_codecs()) \
+        else StdlibJSONCodec
+
+    assert isinstance(get_default_codec(), expected_codec_type)
+
+
+def test_client_codec(stub_server):
+    with SyncClient(stub_server.url, codec=StdlibJSONCodec()) as client:
+        response = client.post("/todos", {}, {"title": "text"})
+
+    assert response["body"] == {"title": "text"}
+    assert stub_server.requests[0].headers["Content-Type"] == "application/json"
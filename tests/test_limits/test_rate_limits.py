@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from RESTModels import ResourceModel, SyncClient, AsyncClient, RateLimit, RetryPolicy, get
+from RESTModels.limits import parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({"Retry-After": "2"}) == 2.0
+    assert parse_retry_after({"Retry-After": "-1"}) == 0.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 < parse_retry_after({"Retry-After": format_datetime(retry_at, usegmt=True)}) <= 30
+
+
+def test_token_bucket():
+    limit = RateLimit(rate=10, burst=2)
+
+    assert limit.reserve() == 0
+    assert limit.reserve() == 0
+    assert limit.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limit.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_pause():
+    limit = RateLimit()
+    limit.observe(429, {"Retry-After": "0.2"})
+    assert limit.reserve() == pytest.approx(0.2, abs=0.01)
+
+    limit = RateLimit()
+    limit.observe(500, {"Retry-After": "5"})
+    assert limit.reserve() == 0
+
+
+def test_sync_concurrency():
+    limit = RateLimit(max_concurrency=2)
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def request():
+        with limit:
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_in_flight) == 2
+
+
+def test_async_concurrency():
+    limit = RateLimit(max_concurrency=3)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def request():
+        nonlocal in_flight, max_in_flight
+        async with limit:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    asyncio.run(main())
+    assert max_in_flight == 3
+
+
+def test_client_rate_limit(stub_server):
+    with SyncClient(stub_server.url, rate_limit=RateLimit(rate=50, burst=1)) as client:
+        started_at = time.monotonic()
+        for _ in range(6):
+            client.get("/todos", {})
+        assert time.monotonic() - started_at >= 0.09
+
+
+def test_endpoint_rate_limit_and_retry_after(stub_server):
+    calls = []
+
+    def throttled_route(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return 429, {"Retry-After": "0.2"}, b"{}"
+        return 200, {}, b'{"ok": true}'
+
+    stub_server.routes["/throttled"] = throttled_route
+
+    limit = RateLimit(rate=100, burst=10)
+
+    class Model(ResourceModel):
+        @get("/throttled", rate_limit=limit, retry=RetryPolicy(attempts=2, backoff=0.001))
+        def get_throttled(self) -> dict:
+            ...
+
+    with SyncClient(stub_server.url) as client:
+        assert Model(client).get_throttled() == {"ok": True}
+
+    assert calls[1] - calls[0] >= 0.2
+    assert limit.paused_until > 0
+
+
+def test_async_client_rate_limit(stub_server):
+    pytest.importorskip("aiohttp")
+
+    class Model(ResourceModel):
+        @get("/todos/{todo_id}")
+        async def get_todo(self, todo_id: int) -> dict:
+            ...
+
+    async def main():
+        async with AsyncClient(stub_server.url, rate_limit=RateLimit(rate=100, max_concurrency=2)) as client:
+            started_at = time.monotonic()
+            await asyncio.gather(*(Model(client).get_todo(i) for i in range(6)))
+            return time.monotonic() - started_at
+
+    assert asyncio.run(main()) >= 0.045
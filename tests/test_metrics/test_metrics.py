@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from RESTModels import ResourceModel, SyncClient, AsyncClient, MetricsRegistry, get
+from RESTModels.metrics import Histogram, Phase, RequestHook
+
+
+class Model(ResourceModel):
+    @get("/todos/{todo_id}")
+    def get_todo(self, todo_id: int) -> dict:
+        ...
+
+    @get("/numbers")
+    def get_numbers(self) -> list[int]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/todos/{todo_id}")
+    async def get_todo(self, todo_id: int) -> dict:
+        ...
+
+
+class RecordingHook(RequestHook):
+    def __init__(self):
+        self.events = []
+
+    def on_phase(self, endpoint, phase, seconds):
+        self.events.append(("phase", endpoint, phase))
+
+    def on_response(self, endpoint, status_code, size):
+        self.events.append(("response", endpoint, status_code))
+
+    def on_error(self, endpoint, phase, error):
+        self.events.append(("error", endpoint, phase, type(error)))
+
+    def on_finish(self, endpoint, seconds):
+        self.events.append(("finish", endpoint))
+
+
+def test_histogram():
+    histogram = Histogram([1.0, 0.1])
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.buckets == (0.1, 1.0)
+    assert histogram.cumulative_counts() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+
+def test_phases(stub_server):
+    hook = RecordingHook()
+    with SyncClient(stub_server.url, hooks=[hook]) as client:
+        Model(client).get_todo(1)
+
+    assert hook.events == [
+        ("phase", "GET /todos/{todo_id}", Phase.BIND),
+        ("response", "GET /todos/{todo_id}", 200),
+        ("phase", "GET /todos/{todo_id}", Phase.NETWORK),
+        ("phase", "GET /todos/{todo_id}", Phase.DECODE),
+        ("phase", "GET /todos/{todo_id}", Phase.PARSE),
+        ("finish", "GET /todos/{todo_id}"),
+    ]
+
+
+def test_async_phases(stub_server):
+    pytest.importorskip("aiohttp")
+    hook = RecordingHook()
+
+    async def main():
+        async with AsyncClient(stub_server.url, hooks=[hook]) as client:
+            await AsyncModel(client).get_todo(1)
+
+    asyncio.run(main())
+
+    assert [event[2] for event in hook.events if event[0] == "phase"] == list(Phase)
+    assert hook.events[-1] == ("finish", "GET /todos/{todo_id}")
+
+
+def test_error_phase(stub_server):
+    hook = RecordingHook()
+    with SyncClient(stub_server.url, hooks=[hook]) as client:
+        with pytest.raises(ValueError):
+            Model(client).get_numbers()  # echo route returns object, not list of ints
+
+    assert ("error", "GET /numbers", Phase.PARSE, ValueError) in hook.events
+    assert hook.events[-1] == ("finish", "GET /numbers")
+
+
+def test_no_hooks(stub_server):
+    with SyncClient(stub_server.url) as client:
+        assert Model(client).get_todo(1)["path"] == "/todos/1"
+        assert client.hooks == []
+
+
+def test_prometheus_export(stub_server):
+    registry = MetricsRegistry(latency_buckets=[10.0], size_buckets=[1024.0])
+    with SyncClient(stub_server.url, hooks=[registry]) as client:
+        model = Model(client)
+        model.get_todo(1)
+        model.get_todo(2)
+        with pytest.raises(ValueError):
+            model.get_numbers()
+
+    text = registry.export_prometheus()
+
+    assert "# TYPE restmodels_phase_seconds histogram" in text
+    assert 'restmodels_phase_seconds_bucket{endpoint="GET /todos/{todo_id}",phase="network",le="10.0"} 2' in text
+    assert 'restmodels_phase_seconds_bucket{endpoint="GET /todos/{todo_id}",phase="network",le="+Inf"} 2' in text
+    assert 'restmodels_phase_seconds_count{endpoint="GET /todos/{todo_id}",phase="parse"} 2' in text
+    assert 'restmodels_request_seconds_count{endpoint="GET /numbers"} 1' in text
+    assert 'restmodels_response_bytes_bucket{endpoint="GET /todos/{todo_id}",le="1024.0"} 2' in text
+    assert 'restmodels_errors_total{endpoint="GET /numbers",phase="parse"} 1' in text
+    assert text.endswith("\n")
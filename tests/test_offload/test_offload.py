@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from types import GenericAlias
+
+import pytest
+
+from RESTModels import ResourceModel, AsyncClient, ParseOffload, ResponseCache, get
+from RESTModels.json_codecs import OrjsonCodec
+from RESTModels.parsers.type_alias_parsers import TypeAliasParser
+from RESTModels.requests import get_endpoint_plan
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@dataclass
+class Todo:
+    id: int
+    title: str
+
+
+class Slow:
+    def __init__(self, thread: str) -> None:
+        self.thread = thread
+
+
+def todos_route(request):
+    count = int(request.query.get("count", 1000))
+    return 200, JSON_HEADERS, json.dumps([{"id": i, "title": f"todo {i}"} for i in range(count)]).encode()
+
+
+thread_offload = ParseOffload(min_size=1000)
+
+
+class Model(ResourceModel):
+    @get("/todos", offload=thread_offload)
+    async def get_todos(self, count: int) -> list[Todo]:
+        ...
+
+    @get("/todos", offload=ParseOffload(min_size=1000), cache_ttl=60)
+    async def get_cached_todos(self, count: int) -> list[Todo]:
+        ...
+
+    @get("/slow", offload=ParseOffload(min_size=0))
+    async def get_slow(self) -> Slow:
+        ...
+
+
+@get_endpoint_plan(Model.get_slow).type_alias_parser.register_type_parser
+def slow_parser(value: object, alias: GenericAlias, alias_parser: TypeAliasParser) -> Slow:
+    time.sleep(0.2)
+    return Slow(threading.current_thread().name)
+
+
+def test_offload_large_responses(stub_server):
+    stub_server.routes["/todos"] = todos_route
+
+    async def main() -> tuple[list[Todo], list[Todo]]:
+        async with AsyncClient(stub_server.url) as client:
+            model = Model(client)
+            return await model.get_todos(1000), await model.get_todos(1)
+
+    large, small = asyncio.run(main())
+
+    assert large[999] == Todo(999, "todo 999")
+    assert small == [Todo(0, "todo 0")]
+    assert thread_offload.offloaded == 1
+
+
+def test_offload_keeps_loop_responsive(stub_server):
+    stub_server.routes["/slow"] = lambda request: (200, JSON_HEADERS, b"{}")
+    ticks = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main() -> Slow:
+        async with AsyncClient(stub_server.url) as client:
+            ticker = asyncio.create_task(tick())
+            try:
+                return await Model(client).get_slow()
+            finally:
+                ticker.cancel()
+
+    slow = asyncio.run(main())
+
+    assert slow.thread.startswith("parse")
+    assert len(ticks) > 10
+
+
+def test_offload_to_process_pool(stub_server):
+    stub_server.routes["/todos"] = todos_route
+
+    async def main(offload: ParseOffload) -> list[Todo]:
+        class ProcessModel(ResourceModel):
+            @get("/todos", offload=offload)
+            async def get_todos(self, count: int) -> list[Todo]:
+                ...
+
+        async with AsyncClient(stub_server.url, codec=OrjsonCodec()) as client:
+            return await ProcessModel(client).get_todos(10)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        todos = asyncio.run(main(ParseOffload(min_size=0, executor=executor)))
+
+    assert todos == [Todo(i, f"todo {i}") for i in range(10)]
+
+
+def test_offload_cached_response(stub_server):
+    stub_server.routes["/todos"] = todos_route
+
+    async def main() -> tuple[list[Todo], list[Todo]]:
+        async with AsyncClient(stub_server.url, cache=ResponseCache()) as client:
+            model = Model(client)
+            return await model.get_cached_todos(100), await model.get_cached_todos(100)
+
+    first, second = asyncio.run(main())
+
+    assert first is second
+    assert len(stub_server.requests) == 1
+
+
+def test_offload_requires_async_endpoint():
+    with pytest.raises(ValueError):
+        @get("/todos", offload=ParseOffload())
+        def get_todos(self) -> list[Todo]:
+            ...
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from RESTModels import (
+    ResourceModel,
+    SyncClient,
+    AsyncClient,
+    CursorPagination,
+    OffsetPagination,
+    LinkPagination,
+    PageError,
+    get,
+    post,
+)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+ITEMS = [str(i) for i in range(10)]
+
+
+def cursor_route(request):
+    start = int(request.query.get("cursor", 0))
+    end = start + 4
+    return 200, JSON_HEADERS, json.dumps({
+        "data": ITEMS[start:end],
+        "meta": {"next": str(end) if end < len(ITEMS) else None},
+    }).encode()
+
+
+def offset_route(request):
+    offset, limit = int(request.query.get("offset", 0)), int(request.query["limit"])
+    return 200, JSON_HEADERS, json.dumps(ITEMS[offset:offset + limit]).encode()
+
+
+def make_link_route(server):
+    def link_route(request):
+        page = int(request.query.get("page", 1))
+        headers = dict(JSON_HEADERS)
+        if page < 3:
+            headers["Link"] = f'<{server.url}/link?page={page + 1}>; rel="next", <{server.url}/link?page=3>; rel="last"'
+        return 200, headers, json.dumps({"items": ITEMS[(page - 1) * 4:page * 4]}).encode()
+
+    return link_route
+
+
+def slow_route(request):
+    time.sleep(0.05)
+    return offset_route(request)
+
+
+class Model(ResourceModel):
+    @get("/cursor", paginate=CursorPagination(items="data", next_cursor="meta.next"))
+    def iter_cursor(self) -> Iterator[int]:
+        ...
+
+    @get("/offset", paginate=OffsetPagination(limit=3), prefetch=0)
+    def iter_offset(self) -> Iterator[int]:
+        ...
+
+    @get("/link", paginate=LinkPagination(items="items"))
+    def iter_link(self) -> Iterator[int]:
+        ...
+
+    @get("/slow", paginate=OffsetPagination(limit=2), prefetch=2)
+    def iter_slow(self) -> Iterator[int]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/cursor", paginate=CursorPagination(items="data", next_cursor="meta.next"))
+    def iter_cursor(self) -> AsyncIterator[int]:
+        ...
+
+    @get("/offset", paginate=OffsetPagination(limit=3), prefetch=0)
+    def iter_offset(self) -> AsyncIterator[int]:
+        ...
+
+
+@pytest.fixture
+def paginated_server(stub_server):
+    stub_server.routes["/cursor"] = cursor_route
+    stub_server.routes["/offset"] = offset_route
+    stub_server.routes["/link"] = make_link_route(stub_server)
+    stub_server.routes["/slow"] = slow_route
+    return stub_server
+
+
+def test_cursor_pagination(paginated_server):
+    with SyncClient(paginated_server.url) as client:
+        assert list(Model(client).iter_cursor()) == list(range(10))
+    assert [request.query.get("cursor") for request in paginated_server.requests] == [None, "4", "8"]
+
+
+def test_offset_pagination(paginated_server):
+    with SyncClient(paginated_server.url) as client:
+        assert list(Model(client).iter_offset()) == list(range(10))
+    assert [request.query for request in paginated_server.requests] == [
+        {"limit": "3"},
+        {"limit": "3", "offset": "3"},
+        {"limit": "3", "offset": "6"},
+        {"limit": "3", "offset": "9"},
+    ]
+
+
+def test_link_pagination(paginated_server):
+    with SyncClient(paginated_server.url) as client:
+        assert list(Model(client).iter_link()) == list(range(10))
+    assert [request.query.get("page") for request in paginated_server.requests] == [None, "2", "3"]
+
+
+def test_prefetch(paginated_server):
+    with SyncClient(paginated_server.url) as client:
+        items = Model(client).iter_slow()
+        assert next(items) == 0
+        time.sleep(0.2)  # next pages are fetched while we wait
+        assert len(paginated_server.requests) >= 3
+
+        started_at = time.monotonic()
+        assert [next(items) for _ in range(5)] == [1, 2, 3, 4, 5]
+        assert time.monotonic() - started_at < 0.05
+
+        items.close()
+
+
+def test_prefetch_error(stub_server):
+    stub_server.routes["/cursor"] = lambda request: (200, JSON_HEADERS, b'{"data": ["a"]}')
+    with SyncClient(stub_server.url) as client:
+        with pytest.raises(ValueError):
+            list(Model(client).iter_cursor())
+
+
+def failing_cursor_route(request):
+    if "cursor" in request.query:
+        return 500, JSON_HEADERS, b'{"error": "unavailable"}'
+    return cursor_route(request)
+
+
+def test_page_error(stub_server):
+    stub_server.routes["/cursor"] = failing_cursor_route
+    items = []
+    with SyncClient(stub_server.url) as client:
+        with pytest.raises(PageError) as error:
+            items.extend(Model(client).iter_cursor())
+
+    assert items == [0, 1, 2, 3]
+    assert error.value.response.status_code == 500
+
+
+def test_only_iterators_paginated():
+    with pytest.raises(ValueError):
+        class ListModel(ResourceModel):
+            @get("/todos", paginate=CursorPagination())
+            def get_todos(self) -> list[int]:
+                ...
+
+    with pytest.raises(ValueError):
+        class PostModel(ResourceModel):
+            @post("/todos", paginate=CursorPagination())
+            def iter_todos(self) -> Iterator[int]:
+                ...
+
+
+def test_async_pagination(paginated_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(paginated_server.url) as client:
+            model = AsyncModel(client)
+            return [item async for item in model.iter_cursor()], [item async for item in model.iter_offset()]
+
+    assert asyncio.run(main()) == (list(range(10)), list(range(10)))
+
+
+def test_async_page_error(stub_server):
+    pytest.importorskip("aiohttp")
+    stub_server.routes["/cursor"] = failing_cursor_route
+    items = []
+
+    async def main():
+        async with AsyncClient(stub_server.url) as client:
+            async for item in AsyncModel(client).iter_cursor():
+                items.append(item)
+
+    with pytest.raises(PageError):
+        asyncio.run(main())
+    assert items == [0, 1, 2, 3]
@@ -0,0 +1,85 @@
+import json
+from dataclasses import dataclass
+from typing import Iterator
+
+from RESTModels import ResourceModel, SyncClient, StringInterner, get
+
+
+def copy(string: str) -> str:
+    return "".join(list(string))  # equal string that's other object
+
+
+def test_interning_shares_equal_strings():
+    value = [{"status": copy("done"), "tags": [copy("urgent"), copy("urgent")]} for _ in range(3)]
+
+    interned = StringInterner()(value)
+
+    assert interned is value
+    assert len({id(item["status"]) for item in interned}) == 1
+    assert interned[0]["tags"][0] is interned[2]["tags"][1]
+
+
+def test_interning_shares_keys():
+    value = [{copy("status"): 1}, {copy("status"): 2}]
+
+    interned = StringInterner()(value)
+
+    assert interned == [{"status": 1}, {"status": 2}]
+    assert next(iter(interned[0])) is next(iter(interned[1]))
+
+
+def test_interning_is_bounded():
+    long_value = [copy("x" * 100), copy("x" * 100)]
+    assert long_value[0] is not long_value[1]
+    interned = StringInterner(max_length=64)(long_value)
+    assert interned[0] is not interned[1]
+
+    values = [copy("done"), copy("todo"), copy("done"), copy("todo")]
+    interned = StringInterner(max_strings=1)(values)
+    assert interned[0] is interned[2]
+    assert interned[1] is not interned[3]
+
+
+def test_interning_memo_is_per_response():
+    interner = StringInterner()
+    first, second = interner([copy("done")]), interner([copy("done")])
+
+    assert first[0] is not second[0]
+
+
+@dataclass
+class Todo:
+    id: int
+    status: str
+
+
+def todos_route(request):
+    body = "[" + ",".join(f'{{"id": {i}, "status": "done"}}' for i in range(5)) + "]"
+    return 200, {"Content-Type": "application/json"}, body.encode()
+
+
+class Model(ResourceModel):
+    @get("/todos", intern_strings=StringInterner())
+    def get_todos(self) -> list[Todo]:
+        ...
+
+    @get("/todos", intern_strings=StringInterner())
+    def iter_todos(self) -> Iterator[Todo]:
+        ...
+
+
+def test_endpoint_interns_strings(stub_server):
+    stub_server.routes["/todos"] = todos_route
+
+    with SyncClient(stub_server.url) as client:
+        todos = Model(client).get_todos()
+        streamed_todos = list(Model(client).iter_todos())
+
+    assert todos == streamed_todos == [Todo(i, "done") for i in range(5)]
+    assert len({id(todo.status) for todo in todos}) == 1
+    assert len({id(todo.status) for todo in streamed_todos}) == 1
+
+
+def test_decoder_doesnt_share_values():
+    decoded = json.loads(todos_route(None)[2])
+    assert decoded[0]["status"] is not decoded[1]["status"]
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+import pytest
+
+from RESTModels.parsers.lazy_parsers import LazyDict, LazyList, compile_lazy_alias
+from RESTModels.parsers.type_alias_parsers import TypeAliasParser
+
+
+@dataclass
+class Item:
+    id: int
+
+
+def test_lazy_list_converts_on_access():
+    type_alias_parser = TypeAliasParser()
+    converted = []
+
+    @type_alias_parser.register_type_parser
+    def item_alias_parser(value, alias, alias_parser) -> Item:
+        converted.append(value)
+        return Item(value)
+
+    result = compile_lazy_alias(list[list[Item]], type_alias_parser)([[1, 2], [3]])
+
+    assert isinstance(result, LazyList)
+    assert len(result) == 2
+    assert converted == []
+
+    assert result[1][0] == Item(3)
+    assert result[1][0] is result[1][0]
+    assert converted == [3]
+
+    assert result == [[Item(1), Item(2)], [Item(3)]]
+    assert result[:1] == [[Item(1), Item(2)]]
+    assert converted == [3, 1, 2]
+
+
+def test_lazy_dict_converts_on_access():
+    type_alias_parser = TypeAliasParser()
+
+    result = compile_lazy_alias(dict[int, list[Item]], type_alias_parser)({"1": [{"id": "5"}], "2": []})
+
+    assert isinstance(result, LazyDict)
+    assert set(result) == {1, 2}
+    assert isinstance(result[1], LazyList)
+    assert result[1][0] == Item(5)
+    assert dict(result) == {1: [Item(5)], 2: []}
+
+    with pytest.raises(KeyError):
+        result[3]
+
+
+def test_lazy_alias_validates_containers():
+    with pytest.raises(ValueError):
+        compile_lazy_alias(list[int], TypeAliasParser())({"key": 1})
+
+    assert compile_lazy_alias(tuple[int], TypeAliasParser())(["1"]) == (1,)
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from RESTModels.parsers.stream_parsers import JSONArrayDecoder, iter_json_array
+
+
+def split_by(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_iter_json_array():
+    items = [1, 23.5, -7, 1e-5, "text ] , [", {"key": [1, {"nested": None}]}, [], True, False, None, "юникод"]
+    data = json.dumps(items, ensure_ascii=False).encode()
+
+    for chunk_size in (1, 2, 3, 7, len(data)):
+        assert list(iter_json_array(split_by(data, chunk_size))) == items
+
+
+def test_iter_empty_json_array():
+    assert list(iter_json_array([b" [ ", b"  ] \n"])) == []
+
+
+def test_decoder_yields_items_before_array_end():
+    decoder = JSONArrayDecoder()
+
+    assert decoder.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+    assert decoder.feed(b': 2}, 12') == [{"id": 2}]
+    assert decoder.feed(b'34') == []
+    assert decoder.feed(b']') == [1234]
+    assert decoder.close() == []
+
+
+def test_invalid_json_array_stream():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"id": 1}']))
+
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2']))
+
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2] 3']))
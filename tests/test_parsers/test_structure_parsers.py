@@ -0,0 +1,184 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Annotated, Generic, Literal, NamedTuple, NotRequired, Optional, TypedDict, TypeVar
+
+import pytest
+
+from RESTModels.parsers.type_alias_parsers import Discriminator, TypeAliasParser
+
+
+@dataclass(slots=True)
+class Todo:
+    id: int
+    title: str
+    due: date
+    tags: list[str] = field(default_factory=list)
+    done: bool = False
+
+
+@dataclass
+class Node:
+    name: str
+    children: list["Node"]
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Box(Generic[T]):
+    value: T
+    items: list[T]
+    default: T | None = None
+
+
+class Pair(NamedTuple, Generic[T]):
+    first: T
+    second: T
+
+
+class Point(NamedTuple):
+    x: float
+    y: float = 0
+
+
+class Event(TypedDict):
+    name: str
+    at: date
+    note: NotRequired[str]
+
+
+def test_parse_dataclass():
+    type_alias_parser = TypeAliasParser()
+
+    data = [
+        {"id": "1", "title": "first", "due": "2023-10-22", "tags": ["a"], "extra": None},
+        {"id": 2, "title": "second", "due": "2023-10-23", "done": True},
+    ]
+
+    assert type_alias_parser(data, list[Todo]) == [
+        Todo(1, "first", date(2023, 10, 22), ["a"]),
+        Todo(2, "second", date(2023, 10, 23), [], True),
+    ]
+
+    with pytest.raises(ValueError):
+        type_alias_parser({"id": 1}, Todo)
+
+    todo = Todo(3, "third", date(2023, 10, 24))
+    assert type_alias_parser(todo, Todo) is todo
+
+
+def test_parse_recursive_dataclass():
+    type_alias_parser = TypeAliasParser()
+
+    data = {"name": "root", "children": [{"name": "leaf", "children": []}]}
+
+    assert type_alias_parser(data, Node) == Node("root", [Node("leaf", [])])
+
+
+def test_parse_generic_structures():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser({"value": "1", "items": ["2"]}, Box[int]) == Box(1, [2])
+    assert type_alias_parser({"value": 1, "items": [], "default": 2}, Box[str]) == Box("1", [], "2")
+    assert type_alias_parser(["1", 2], Pair[int]) == Pair(1, 2)
+
+
+def test_parse_named_tuple():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser({"x": "1.5"}, Point) == Point(1.5, 0)
+    assert type_alias_parser([1, 2], Point) == Point(1.0, 2.0)
+    assert isinstance(type_alias_parser([1, 2], Point), Point)
+    assert type_alias_parser([1], Point) == Point(1.0, 0)
+
+    with pytest.raises(ValueError):
+        type_alias_parser([3, 4, 5], Point)
+    with pytest.raises(ValueError):
+        type_alias_parser([], Point)
+
+
+def test_parse_typed_dict():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser({"name": 1, "at": "2023-10-22"}, Event) == {"name": "1", "at": date(2023, 10, 22)}
+    assert type_alias_parser({"name": "a", "at": "2023-10-22", "note": 5}, Event)["note"] == "5"
+
+    with pytest.raises(ValueError):
+        type_alias_parser({"name": "a"}, Event)
+
+
+def test_structure_in_union():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser({"x": 1, "y": 2}, Optional[Point]) == Point(1, 2)
+    assert type_alias_parser({"name": "a", "children": []}, Todo | Node) == Node("a", [])
+
+
+@dataclass
+class Cat:
+    name: str
+    kind: Literal["cat"] = "cat"
+
+
+@dataclass
+class Dog:
+    name: str
+    good: bool = True
+    kind: str = "dog"
+
+
+def test_union_dispatches_on_json_type():
+    type_alias_parser = TypeAliasParser()
+
+    expected_type = list[int | str | Point | Todo]
+
+    assert type_alias_parser([1, "1", [1, 2]], expected_type) == [1, "1", Point(1, 2)]
+    assert type_alias_parser([{"x": 1}], list[str | Point]) == [Point(1, 0)]
+    assert type_alias_parser([5.5, None], list[int | float | None]) == [5.5, None]
+
+
+def test_union_falls_back_to_other_members():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["5"], list[int | None]) == [5]
+    assert type_alias_parser([5], list[str | list[int]]) == ["5"]
+
+    with pytest.raises(ValueError):
+        type_alias_parser([[1]], list[int | None])
+
+
+def test_discriminated_union():
+    type_alias_parser = TypeAliasParser()
+
+    expected_type = list[Annotated[Cat | Dog, Discriminator("kind")]]
+
+    assert type_alias_parser([{"kind": "dog", "name": "a"}, {"kind": "cat", "name": "b"}], expected_type) == [
+        Dog("a"),
+        Cat("b"),
+    ]
+
+    with pytest.raises(ValueError):
+        type_alias_parser([{"kind": "cow", "name": "a"}], expected_type)
+
+    with pytest.raises(ValueError):
+        type_alias_parser(["cat"], expected_type)
+
+
+def test_parse_annotated():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["1"], list[Annotated[int, "meta"]]) == [1]
+
+
+def test_parse_literal():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["a", 1, True], list[Literal["a", 1, True]]) == ["a", 1, True]
+    assert type(type_alias_parser(True, Literal[1, True])) is bool
+
+    with pytest.raises(ValueError):
+        type_alias_parser("b", Literal["a", 1])
+
+    with pytest.raises(ValueError):
+        type_alias_parser(True, Literal[1])
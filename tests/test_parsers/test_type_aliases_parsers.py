@@ -1,10 +1,12 @@
-from typing import Union
-from datetime import datetime, date, time, timedelta
+from enum import Enum, IntEnum, StrEnum
+from typing import Annotated, Any, Literal, Union
+from array import array
+from datetime import datetime, date, time, timedelta, timezone
 from decimal import Decimal
 
 import pytest
 
-from RESTModels.parsers.type_alias_parsers import TypeAliasParser
+from RESTModels.parsers.type_alias_parsers import TypeAliasParser, DateTimeFormat
 
 
 def test_parse_str():
@@ -170,6 +172,64 @@ def test_parse_timedelta():
         assert type_alias_parser(data, expected_type) == expected_result
 
 
+def test_parse_iso_duration():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser("P1DT2H30M", timedelta) == timedelta(days=1, hours=2, minutes=30)
+    assert type_alias_parser("-PT0.5S", timedelta) == timedelta(seconds=-0.5)
+    assert type_alias_parser("PT1,5M", timedelta) == timedelta(seconds=90)
+    assert type_alias_parser(["P2W", "PT15M"], list[timedelta]) == [timedelta(weeks=2), timedelta(minutes=15)]
+
+    for value in ("P", "PT", "P1Y", "P1M", "1 day", "PT1H2D"):
+        with pytest.raises(ValueError):
+            type_alias_parser(value, timedelta)
+
+
+def test_parse_datetime_list():
+    type_alias_parser = TypeAliasParser()
+
+    timestamps = [f"2023-10-22T19:50:{second:02}+00:00" for second in range(60)]
+    expected_result = [datetime.fromisoformat(timestamp) for timestamp in timestamps]
+    assert type_alias_parser(timestamps, list[datetime]) == expected_result
+
+    repeated = ["".join(timestamps[i % 3]) for i in range(300)]  # equal strings that are other objects
+    parsed = type_alias_parser(repeated, list[datetime])
+    assert parsed == [expected_result[i % 3] for i in range(300)]
+    assert len({id(dt) for dt in parsed}) == 3
+
+    mixed = [timestamps[0], expected_result[1]]
+    assert type_alias_parser(mixed, list[datetime]) == expected_result[:2]
+    assert type_alias_parser(["2023-10-22", "2023-10-23"], list[date]) == [date(2023, 10, 22), date(2023, 10, 23)]
+    assert type_alias_parser(["19:50", 5], list[time]) == [time(19, 50), time(5)]
+
+    with pytest.raises(ValueError):
+        type_alias_parser(["2023-10-22", "not date"], list[date])
+
+
+def test_datetime_list_uses_registered_parser():
+    type_alias_parser = TypeAliasParser()
+
+    @type_alias_parser.register_type_parser
+    def timestamp_alias_parser(value, alias, alias_parser) -> datetime:
+        return datetime.fromtimestamp(value, timezone.utc)
+
+    assert type_alias_parser([0], list[datetime]) == [datetime(1970, 1, 1, tzinfo=timezone.utc)]
+
+
+def test_parse_datetime_format():
+    type_alias_parser = TypeAliasParser()
+
+    expected_type = Annotated[datetime, DateTimeFormat("%d.%m.%Y %H:%M")]
+
+    assert type_alias_parser("22.10.2023 19:50", expected_type) == datetime(2023, 10, 22, 19, 50)
+    assert type_alias_parser(["22.10.2023 19:50"] * 3, list[expected_type]) == [datetime(2023, 10, 22, 19, 50)] * 3
+    assert type_alias_parser("22.10.2023", Annotated[date, DateTimeFormat("%d.%m.%Y")]) == date(2023, 10, 22)
+
+    for value in ("2023-10-22T19:50", 0):
+        with pytest.raises(ValueError):
+            type_alias_parser(value, expected_type)
+
+
 def test_parse_none():
     type_alias_parser = TypeAliasParser()
 
@@ -416,7 +476,7 @@ def test_parse_old_union():
     expected_results = (
         "test",
         15,
-        6,
+        6.3,
     )
 
     for data, expected_result in zip(input_datas, expected_results):
@@ -437,8 +497,205 @@ def test_parse_new_union():
     expected_results = (
         "test",
         15,
-        6,
+        6.3,
     )
 
     for data, expected_result in zip(input_datas, expected_results):
         assert type_alias_parser(data, expected_type) == expected_result
+
+
+def test_parse_dict_with_nested():
+    type_alias_parser = TypeAliasParser()
+
+    input_data = {"first": ["1", "2023-10-22T19:50:29.182993"]}
+    expected_type = dict[str, tuple[int, datetime]]
+
+    expected_result = {"first": (1, datetime.fromisoformat("2023-10-22T19:50:29.182993"))}
+
+    assert type_alias_parser(input_data, expected_type) == expected_result
+    assert type_alias_parser(input_data, dict) == input_data
+
+
+def test_parse_variadic_tuple():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["1", 2, 3.0], tuple[int, ...]) == (1, 2, 3)
+
+    with pytest.raises(ValueError):
+        type_alias_parser([1, 2, 3], tuple[int, int])
+
+
+def test_union_members_order_is_kept_in_cache():
+    type_alias_parser = TypeAliasParser()
+
+    dt = datetime.fromisoformat("2023-10-22T19:50:29.182993")
+
+    assert type_alias_parser([dt.isoformat()], list[Union[datetime, str]]) == [dt]
+    assert type_alias_parser([dt.isoformat()], list[Union[str, datetime]]) == [dt.isoformat()]
+
+
+def test_compiled_alias_is_cached():
+    type_alias_parser = TypeAliasParser()
+
+    expected_type = list[tuple[int, str]]
+
+    assert type_alias_parser.compile(expected_type) is type_alias_parser.compile(list[tuple[int, str]])
+
+
+def test_register_type_parser_invalidates_compiled_aliases():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["5"], list[int]) == [5]
+
+    @type_alias_parser.register_type_parser
+    def negative_int_alias_parser(value, alias, alias_parser) -> int:
+        return -int(value)
+
+    assert type_alias_parser(["5"], list[int]) == [-5]
+    assert TypeAliasParser()(["5"], list[int]) == [5]
+
+
+def test_register_general_type_parser_invalidates_compiled_aliases():
+    type_alias_parser = TypeAliasParser()
+
+    class Point:
+        def __init__(self, x: int) -> None:
+            self.x = x
+
+    with pytest.raises(ValueError):
+        type_alias_parser([1], list[Point])
+
+    @TypeAliasParser.register_general_type_parser
+    def point_alias_parser(value, alias, alias_parser) -> Point:
+        return Point(alias_parser(value, int))
+
+    try:
+        assert [point.x for point in type_alias_parser(["1"], list[Point])] == [1]
+    finally:
+        del TypeAliasParser.general_types_parsers[Point]
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class Priority(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Status(StrEnum):
+    OPEN = "open"
+    CLOSED = "closed"
+
+    @classmethod
+    def _missing_(cls, value: object) -> "Status | None":
+        return cls(value.lower()) if isinstance(value, str) and value != value.lower() else None
+
+
+def test_parse_enum():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser(["red", "green", Color.RED], list[Color]) == [Color.RED, Color.GREEN, Color.RED]
+    assert type_alias_parser([1, 2.0], list[Priority]) == [Priority.LOW, Priority.HIGH]
+    assert type(type_alias_parser(1, Priority)) is Priority
+    assert type_alias_parser("CLOSED", Status) is Status.CLOSED
+
+    for value in ("blue", ["red"], None):
+        with pytest.raises(ValueError):
+            type_alias_parser(value, Color)
+
+
+def test_parse_enum_in_union_and_literal():
+    type_alias_parser = TypeAliasParser()
+
+    assert type_alias_parser([1, "1"], list[Union[str, Priority]]) == [Priority.LOW, "1"]
+    assert type_alias_parser("red", Literal[Color.RED]) is Color.RED
+
+    with pytest.raises(ValueError):
+        type_alias_parser("green", Literal[Color.RED])
+
+
+def test_subclass_uses_parser_of_base_class():
+    type_alias_parser = TypeAliasParser()
+
+    class UserId(str):
+        pass
+
+    class Timestamp(datetime):
+        pass
+
+    user_id = type_alias_parser("user-1", UserId)
+    assert type(user_id) is UserId and user_id == "user-1"
+    assert type(type_alias_parser("2023-10-22T19:50:29", Timestamp)) is Timestamp
+
+    class Money:
+        def __init__(self, cents: int) -> None:
+            self.cents = cents
+
+    class Dollars(Money):
+        pass
+
+    @type_alias_parser.register_type_parser
+    def money_alias_parser(value, alias, alias_parser) -> Money:
+        return alias(round(value * 100))
+
+    dollars = type_alias_parser(1.5, Dollars)
+    assert type(dollars) is Dollars and dollars.cents == 150
+    assert type_alias_parser.resolved_parsers[Dollars] is money_alias_parser
+
+
+def test_container_subclass_uses_own_constructor():
+    type_alias_parser = TypeAliasParser()
+
+    class Tags(list):
+        pass
+
+    class Scores(list[int]):
+        pass
+
+    class Config(dict[str, float]):
+        pass
+
+    tags = type_alias_parser(["a", 1], Tags)
+    assert type(tags) is Tags and tags == ["a", 1]
+
+    scores = type_alias_parser(["1", 2], Scores)
+    assert type(scores) is Scores and scores == [1, 2]
+
+    config = type_alias_parser({"rate": "0.5"}, Config)
+    assert type(config) is Config and config == {"rate": 0.5}
+    assert type(type_alias_parser([{"rate": 1}], list[Config])[0]) is Config
+
+
+def test_parse_array():
+    type_alias_parser = TypeAliasParser()
+
+    ints = type_alias_parser([1, 2, 3], array)
+    assert ints.typecode == "q"
+    assert ints.tolist() == [1, 2, 3]
+
+    floats = type_alias_parser([1, 2.5], array)
+    assert floats.typecode == "d"
+    assert floats.tolist() == [1.0, 2.5]
+
+    assert type_alias_parser(["1.5", 2], array).tolist() == [1.5, 2.0]
+    assert type_alias_parser([[1], [2, 3]], list[array]) == [array("q", [1]), array("q", [2, 3])]
+
+    with pytest.raises(ValueError):
+        type_alias_parser([None], array)
+
+
+def test_parse_ndarray():
+    np = pytest.importorskip("numpy")
+
+    type_alias_parser = TypeAliasParser()
+
+    floats = type_alias_parser([1, "2.5"], np.ndarray[Any, np.dtype[np.float32]])
+    assert floats.dtype == np.float32
+    assert floats.tolist() == [1.0, 2.5]
+
+    matrix = type_alias_parser([[1, 2], [3, 4]], np.ndarray)
+    assert matrix.shape == (2, 2)
+    assert matrix.dtype.kind == "i"
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from RESTModels import (
+    ResourceModel,
+    SyncClient,
+    AsyncClient,
+    RetryPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    get,
+    post,
+)
+from RESTModels.policies import CircuitState
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def flaky_route(failures):
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return 503, JSON_HEADERS, b'{"error": "unavailable"}'
+        return 200, JSON_HEADERS, json.dumps({"attempt": len(calls)}).encode()
+
+    return route
+
+
+def slow_first_route(delay):
+    calls = []
+
+    def route(request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(delay)
+        return 200, JSON_HEADERS, json.dumps({"call": len(calls)}).encode()
+
+    return route
+
+
+class Model(ResourceModel):
+    @get("/flaky", retry=RetryPolicy(attempts=3, backoff=0.001))
+    def get_flaky(self) -> dict:
+        ...
+
+    @get("/flaky", retry=RetryPolicy(attempts=2, backoff=0.001))
+    def get_flaky_twice(self) -> dict:
+        ...
+
+    @get("/slow", hedge=HedgePolicy(delay=0.05))
+    def get_slow(self) -> dict:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/flaky", retry=RetryPolicy(attempts=3, backoff=0.001))
+    async def get_flaky(self) -> dict:
+        ...
+
+    @get("/slow", hedge=HedgePolicy(delay=0.05))
+    async def get_slow(self) -> dict:
+        ...
+
+
+def test_retry_statuses(stub_server):
+    stub_server.routes["/flaky"] = flaky_route(failures=2)
+    with SyncClient(stub_server.url) as client:
+        assert Model(client).get_flaky() == {"attempt": 3}
+
+
+def test_retry_gives_up(stub_server):
+    stub_server.routes["/flaky"] = flaky_route(failures=5)
+    with SyncClient(stub_server.url) as client:
+        assert Model(client).get_flaky_twice() == {"error": "unavailable"}
+    assert len(stub_server.requests) == 2
+
+
+def test_retry_transient_errors(stub_server):
+    url = stub_server.url
+    stub_server.shutdown()
+    stub_server.server_close()
+
+    class DownModel(ResourceModel):
+        @get("/todos", retry=RetryPolicy(attempts=3, backoff=0.001))
+        def get_todos(self) -> dict:
+            ...
+
+    calls = []
+    with SyncClient(url) as client:
+        send = client.send
+        client.send = lambda *args, **kwargs: calls.append(1) or send(*args, **kwargs)
+        with pytest.raises(requests.ConnectionError):
+            DownModel(client).get_todos()
+    assert len(calls) == 3
+
+
+def test_retry_delay():
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.3)
+    for _ in range(100):
+        assert 0 <= policy.delay(0) <= 0.1
+        assert 0 <= policy.delay(5) <= 0.3
+
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_only_idempotent_methods():
+    with pytest.raises(ValueError):
+        class BadModel(ResourceModel):
+            @post("/todos", retry=RetryPolicy())
+            def make_todo(self) -> dict:
+                ...
+
+
+def test_circuit_breaker(stub_server):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    class BreakerModel(ResourceModel):
+        @get("/flaky", circuit_breaker=breaker)
+        def get_flaky(self) -> dict:
+            ...
+
+    stub_server.routes["/flaky"] = flaky_route(failures=3)
+    with SyncClient(stub_server.url) as client:
+        model = BreakerModel(client)
+        model.get_flaky()
+        model.get_flaky()
+        assert breaker.state is CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            model.get_flaky()
+        assert len(stub_server.requests) == 2
+
+        time.sleep(0.06)
+        model.get_flaky()  # trial call fails
+        assert breaker.state is CircuitState.OPEN
+
+        time.sleep(0.06)
+        assert model.get_flaky() == {"attempt": 4}
+        assert breaker.state is CircuitState.CLOSED
+
+
+def test_circuit_breaker_trial_error(stub_server):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+
+    class BreakerModel(ResourceModel):
+        @get("/flaky", circuit_breaker=breaker)
+        def get_flaky(self) -> dict:
+            ...
+
+    stub_server.routes["/flaky"] = flaky_route(failures=1)
+    with SyncClient(stub_server.url) as client:
+        model = BreakerModel(client)
+        model.get_flaky()
+        assert breaker.state is CircuitState.OPEN
+
+        time.sleep(0.06)
+        send = client.send
+        client.send = lambda *args, **kwargs: 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            model.get_flaky()  # trial call fails with error that isn't transient
+        assert breaker.state is CircuitState.OPEN
+
+        client.send = send
+        time.sleep(0.06)
+        assert model.get_flaky() == {"attempt": 2}
+        assert breaker.state is CircuitState.CLOSED
+
+
+def test_hedge(stub_server):
+    stub_server.routes["/slow"] = slow_first_route(delay=0.5)
+    with SyncClient(stub_server.url) as client:
+        started_at = time.monotonic()
+        assert Model(client).get_slow() == {"call": 2}
+        assert time.monotonic() - started_at < 0.4
+
+
+def test_hedge_busy_pool(stub_server):
+    hedge = HedgePolicy(delay=0.05, max_workers=2)
+
+    class HedgedModel(ResourceModel):
+        @get("/slow", hedge=hedge)
+        def get_slow(self) -> dict:
+            ...
+
+    stub_server.routes["/slow"] = lambda request: time.sleep(0.2) or (200, JSON_HEADERS, b"{}")
+    with SyncClient(stub_server.url) as client:
+        model = HedgedModel(client)
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(6) as executor:
+            list(executor.map(lambda _: model.get_slow(), range(6)))
+
+    assert time.monotonic() - started_at < 0.35
+    assert hedge.hedged == 0
+    assert len(stub_server.requests) == 6
+
+
+def test_hedge_delay_percentile():
+    hedge = HedgePolicy(percentile=50, min_samples=5)
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        hedge.record(latency)
+    assert hedge.delay is None
+
+    hedge.record(0.5)
+    assert hedge.delay == 0.3
+
+
+def test_async_policies(stub_server):
+    pytest.importorskip("aiohttp")
+    stub_server.routes["/flaky"] = flaky_route(failures=2)
+    stub_server.routes["/slow"] = slow_first_route(delay=0.5)
+
+    async def main():
+        async with AsyncClient(stub_server.url) as client:
+            model = AsyncModel(client)
+            flaky = await model.get_flaky()
+            started_at = time.monotonic()
+            slow = await model.get_slow()
+            return flaky, slow, time.monotonic() - started_at
+
+    flaky, slow, slow_time = asyncio.run(main())
+
+    assert flaky == {"attempt": 3}
+    assert slow == {"call": 2}
+    assert slow_time < 0.4
@@ -0,0 +1,110 @@
+from http import HTTPMethod
+from typing import Any
+
+from RESTModels import ResourceModel, get, post
+from RESTModels.clients import Client
+from RESTModels.requests import get_endpoint_plan
+from RESTModels.resources import BodyType
+
+
+class FakeClient(Client):
+    def __init__(self, response: Any = None) -> None:
+        super().__init__("http://test")
+        self.response = response
+        self.calls: list[tuple[str, HTTPMethod, dict[str, Any], Any]] = []
+
+    def _record(self, method: HTTPMethod, endpoint_path: str, params: dict[str, Any], body: Any = None) -> Any:
+        self.calls.append((endpoint_path, method, params, body))
+        return self.response
+
+    def get(self, endpoint_path, params):
+        return self._record(HTTPMethod.GET, endpoint_path, params)
+
+    def post(self, endpoint_path, params, body):
+        return self._record(HTTPMethod.POST, endpoint_path, params, body)
+
+    def delete(self, endpoint_path, params, body):
+        return self._record(HTTPMethod.DELETE, endpoint_path, params, body)
+
+    def put(self, endpoint_path, params, body):
+        return self._record(HTTPMethod.PUT, endpoint_path, params, body)
+
+    def patch(self, endpoint_path, params, body):
+        return self._record(HTTPMethod.PATCH, endpoint_path, params, body)
+
+
+class Model(ResourceModel):
+    @get("/users/{user_id}/todos")
+    def get_todos(self, user_id: int, done: bool = False) -> list[int]:
+        ...
+
+    @post("/users/{user_id}/todo", body=("title", "done"))
+    def make_todo(self, user_id: int, title: str, done: bool) -> None:
+        ...
+
+    @post("/note", body=("text",), body_type=BodyType.FLAT)
+    def make_note(self, text: str, tag: str) -> str:
+        ...
+
+
+def test_get_request():
+    client = FakeClient(["1", 2])
+    model = Model(client)
+
+    assert model.get_todos(5) == [1, 2]
+    assert model.get_todos(user_id=6, done=True) == [1, 2]
+    assert client.calls == [
+        ("/users/5/todos", HTTPMethod.GET, {"done": False}, None),
+        ("/users/6/todos", HTTPMethod.GET, {"done": True}, None),
+    ]
+
+
+def test_post_request():
+    client = FakeClient()
+    model = Model(client)
+
+    assert model.make_todo(1, "text", done=True) is None
+    assert model.make_note("text", "tag") == "None"
+    assert client.calls == [
+        ("/users/1/todo", HTTPMethod.POST, {}, {"title": "text", "done": True}),
+        ("/note", HTTPMethod.POST, {"tag": "tag"}, "text"),
+    ]
+
+
+def test_decorated_method_keeps_metadata():
+    assert Model.get_todos.__name__ == "get_todos"
+
+
+def test_lazy_request():
+    class LazyModel(ResourceModel):
+        @get("/todos", lazy=True)
+        def get_todos(self) -> dict[str, list[int]]:
+            ...
+
+    todos = LazyModel(FakeClient({"first": ["1", "2"]})).get_todos()
+
+    assert todos["first"] == [1, 2]
+
+
+def test_lazy_converter_compiled_once():
+    class Count(int):
+        pass
+
+    class LazyModel(ResourceModel):
+        @get("/todos", lazy=True)
+        def get_todos(self) -> list[Count]:
+            ...
+
+    plan = get_endpoint_plan(LazyModel.get_todos)
+    model = LazyModel(FakeClient(["1", "2"]))
+    assert model.get_todos()[0] == 1
+    convert = plan.convert_lazy
+    model.get_todos()
+    assert plan.convert_lazy is convert
+
+    @plan.type_alias_parser.register_type_parser
+    def count_parser(value: Any, alias: Any, alias_parser: Any) -> Count:
+        return Count(int(value) * 10)
+
+    assert model.get_todos()[0] == 10
+    assert plan.convert_lazy is not convert
@@ -0,0 +1,78 @@
+import asyncio
+from typing import AsyncIterator
+
+from RESTModels import ResourceModel, SyncClient, AsyncClient, get, post
+from RESTModels.requests import get_endpoint_plan
+
+
+class Model(ResourceModel):
+    @get("/todos/{todo_id}")
+    def get_todo(self, todo_id: int) -> dict[str, str | int]:
+        ...
+
+    @post("/todos", body=("title",))
+    def make_todo(self, title: str) -> dict[str, str]:
+        ...
+
+    @get("/todos", lazy=True)
+    def get_todos(self) -> list[dict[str, int]]:
+        ...
+
+
+class ChildModel(Model):
+    def make_todo(self, title: str) -> dict[str, str]:  # type: ignore[override]
+        return {"title": title}
+
+    @get("/notes")
+    def get_notes(self) -> AsyncIterator[tuple[int, str]]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/todos/{todo_id}")
+    async def get_todo(self, todo_id: int) -> dict[str, str | int]:
+        ...
+
+
+def test_endpoints():
+    methods = (Model.get_todo, Model.make_todo, Model.get_todos)
+    assert Model.endpoints() == [get_endpoint_plan(method) for method in methods]
+    assert [plan.name for plan in ChildModel.endpoints()] == ["GET /todos/{todo_id}", "GET /todos", "GET /notes"]
+    assert get_endpoint_plan(ChildModel.make_todo) is None
+
+
+def test_warmup_compiles_converters_and_opens_connections(stub_server):
+    with SyncClient(stub_server.url) as client:
+        model = ChildModel(client)
+        model.warmup(connections=3)
+
+        for plan in ChildModel.endpoints():
+            assert plan.type_alias_parser.compiled_types
+
+        warmup_peers = {request.peer for request in stub_server.requests}
+        assert [request.method for request in stub_server.requests] == ["HEAD"] * 3
+        assert len(warmup_peers) == 3
+
+        assert model.get_todo(1)["path"] == "/todos/1"
+        assert stub_server.requests[-1].peer in warmup_peers
+
+
+def test_warmup_connections_limited_by_pool_size(stub_server):
+    with SyncClient(stub_server.url, pool_maxsize=2, pool_block=True) as client:
+        client.warmup(connections=3)
+
+    assert [request.method for request in stub_server.requests] == ["HEAD"] * 2
+
+
+def test_async_warmup_opens_connections(stub_server):
+    async def main() -> None:
+        async with AsyncClient(stub_server.url) as client:
+            model = AsyncModel(client)
+            await model.warmup(connections=2)
+            await asyncio.gather(model.get_todo(1), model.get_todo(2))
+
+    asyncio.run(main())
+
+    warmup_requests, requests = stub_server.requests[:2], stub_server.requests[2:]
+    assert [request.method for request in warmup_requests] == ["HEAD"] * 2
+    assert {request.peer for request in requests} == {request.peer for request in warmup_requests}
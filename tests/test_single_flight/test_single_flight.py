@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from RESTModels import AsyncClient, ResourceModel, SingleFlight, SyncClient, get, post
+
+
+def slow_route(request):
+    time.sleep(0.1)
+    return 200, {}, b"[1, 2]"
+
+
+class Model(ResourceModel):
+    @get("/todos")
+    def get_todos(self, page: int = 0) -> list[int]:
+        ...
+
+    @post("/todos")
+    def post_todos(self) -> list[int]:
+        ...
+
+
+class AsyncModel(ResourceModel):
+    @get("/todos")
+    async def get_todos(self, page: int = 0) -> list[int]:
+        ...
+
+
+def test_identical_requests_are_coalesced(stub_server):
+    stub_server.routes["/todos"] = slow_route
+    single_flight = SingleFlight()
+
+    with SyncClient(stub_server.url, single_flight=single_flight) as client:
+        model = Model(client)
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda i: model.get_todos(page=i % 2), range(10)))
+
+    assert results == [[1, 2]] * 10
+    assert results[0] is results[2]
+    assert len(stub_server.requests) == 2
+    assert (single_flight.calls, single_flight.coalesced) == (10, 8)
+
+
+def test_unsafe_methods_are_not_coalesced(stub_server):
+    stub_server.routes["/todos"] = slow_route
+    single_flight = SingleFlight()
+
+    with SyncClient(stub_server.url, single_flight=single_flight) as client:
+        model = Model(client)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda i: model.post_todos(), range(3)))
+
+    assert len(stub_server.requests) == 3
+    assert single_flight.coalesced == 0
+
+
+def test_errors_are_shared():
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.do, "key", fail)
+        started.wait()
+        follower = executor.submit(single_flight.do, "key", fail)
+
+        with pytest.raises(ValueError):
+            leader.result()
+        with pytest.raises(ValueError):
+            follower.result()
+
+    assert single_flight.coalesced == 1
+
+
+def test_async_identical_requests_are_coalesced(stub_server):
+    pytest.importorskip("aiohttp")
+
+    async def main():
+        async with AsyncClient(stub_server.url, single_flight=single_flight) as client:
+            model = AsyncModel(client)
+            return await asyncio.gather(*(model.get_todos() for _ in range(10)))
+
+    stub_server.routes["/todos"] = slow_route
+    single_flight = SingleFlight()
+
+    assert asyncio.run(main()) == [[1, 2]] * 10
+    assert len(stub_server.requests) == 1
+    assert single_flight.coalesced == 9
+
+
+def test_async_followers_survive_leader_cancel():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(single_flight.do_async("key", call))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(single_flight.do_async("key", call)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return leader, await asyncio.gather(*followers)
+
+    leader, results = asyncio.run(main())
+
+    assert leader.cancelled()
+    assert results == [2, 2]
+    assert (single_flight.calls, single_flight.coalesced) == (3, 1)